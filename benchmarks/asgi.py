@@ -0,0 +1,188 @@
+"""
+Throughput, tail latency and event loop lag of boosted and plain Django ASGI applications under concurrent requests.
+
+    $ cd tests
+    $ python manage.py migrate
+    $ DJANGO_SETTINGS_MODULE=proj.settings DJANGO_DATABASE_FOR_TEST=sqlite3 python ../benchmarks/asgi.py --output asgi.json
+
+Requests are sent to the applications in-process, so no server or network is involved.
+The plain application has no Tortoise connections, so the abjects variant runs on the boosted one only.
+Users created for the benchmark are deleted when it finishes.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import time
+
+import common  # noqa: F401
+
+
+VARIANTS = {
+    'objects': '/users/sync/',
+    'sync_to_async': '/users/sync-to-async/',
+    'abjects': '/users/',
+}
+
+APPLICATIONS = ('boosted', 'plain')
+
+
+async def request(application, path):
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': b'',
+        'root_path': '',
+        'headers': [(b'host', b'localhost')],
+        'client': ('127.0.0.1', 0),
+        'server': ('localhost', 80),
+    }
+    messages = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+    disconnected = asyncio.Event()
+    status = None
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        await disconnected.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+        elif message['type'] == 'http.response.body' and not message.get('more_body'):
+            disconnected.set()
+
+    await application(scope, receive, send)
+    return status
+
+
+async def measure_loop_lag(interval, lags):
+    loop = asyncio.get_running_loop()
+    while True:
+        scheduled_at = loop.time()
+        await asyncio.sleep(interval)
+        lags.append(loop.time() - scheduled_at - interval)
+
+
+async def run_load(application, path, concurrency, requests):
+    latencies, statuses, lags = [], [], []
+    pending = iter(range(requests))
+
+    async def worker():
+        for _ in pending:
+            started_at = time.perf_counter()
+            statuses.append(await request(application, path))
+            latencies.append(time.perf_counter() - started_at)
+
+    lag_task = asyncio.create_task(measure_loop_lag(0.005, lags))
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    duration = time.perf_counter() - started_at
+    lag_task.cancel()
+
+    latencies_ms = sorted(latency * 1000 for latency in latencies)
+    lags_ms = sorted(lag * 1000 for lag in lags) or [0.0]
+    percentiles = statistics.quantiles(latencies_ms, n=100, method='inclusive')
+    return {
+        'requests': requests,
+        'errors': sum(status != 200 for status in statuses),
+        'requests_per_second': requests / duration,
+        'p50_ms': percentiles[49],
+        'p90_ms': percentiles[89],
+        'p99_ms': percentiles[98],
+        'max_ms': latencies_ms[-1],
+        'loop_lag_mean_ms': statistics.fmean(lags_ms),
+        'loop_lag_max_ms': lags_ms[-1],
+    }
+
+
+async def run(args):
+    from django.core.asgi import get_asgi_application
+    from proj.asgi import application as boosted_application
+
+    startup, shutdown = asyncio.Queue(), asyncio.Queue()
+    await startup.put({'type': 'lifespan.startup'})
+    lifespan = asyncio.create_task(boosted_application({'type': 'lifespan'}, startup.get, shutdown.put))
+    assert (await shutdown.get())['type'] == 'lifespan.startup.complete'
+
+    applications = {'boosted': boosted_application, 'plain': get_asgi_application()}
+
+    results = []
+    try:
+        for application_name in args.application or APPLICATIONS:
+            application = applications[application_name]
+
+            for variant, path in VARIANTS.items():
+                if args.variant and variant not in args.variant:
+                    continue
+                if application_name == 'plain' and variant == 'abjects':
+                    continue
+
+                # warm up connections and code paths
+                await run_load(application, path, 1, 5)
+
+                for concurrency in args.concurrency:
+                    result = {'application': application_name, 'variant': variant, 'concurrency': concurrency}
+                    result.update(await run_load(application, path, concurrency, args.requests))
+                    results.append(result)
+                    print(
+                        f'{application_name:>7} {variant:>14} x{concurrency:<4}: '
+                        f'{result["requests_per_second"]:.0f} req/s, p99 {result["p99_ms"]:.2f} ms, '
+                        f'loop lag max {result["loop_lag_max_ms"]:.2f} ms, {result["errors"]} errors',
+                        file=sys.stderr,
+                    )
+    finally:
+        await startup.put({'type': 'lifespan.shutdown'})
+        await lifespan
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 10, 50])
+    parser.add_argument('--users', type=int, default=50, help='users returned by every request')
+    parser.add_argument('--application', action='append', choices=APPLICATIONS, help='run the given applications only')
+    parser.add_argument('--variant', action='append', choices=VARIANTS, help='run the given variants only')
+    parser.add_argument('--output', help='write JSON results to the file instead of stdout')
+    args = parser.parse_args()
+
+    import django
+    django.setup()
+
+    from django.contrib.auth.models import User
+
+    max_id = User.objects.order_by('-id').values_list('id', flat=True).first() or 0
+    User.objects.bulk_create([User(username=f'benchmark-{max_id}-{i}') for i in range(args.users)])
+
+    try:
+        results = asyncio.run(run(args))
+    finally:
+        User.objects.filter(id__gt=max_id).delete()
+
+    report = json.dumps({
+        'python': platform.python_version(),
+        'django': django.__version__,
+        'arguments': vars(args),
+        'results': results,
+    }, indent=2)
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            output.write(report)
+    else:
+        print(report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+import asyncio
+import datetime
+import decimal
+import sys
+import uuid
+from pathlib import Path
+
+# benchmarks run from the tests directory, like the test suite does
+sys.path[:0] = [str(Path(__file__).resolve().parent.parent / 'src'), str(Path.cwd())]
+
+
+def setup(loop=None):
+    import django
+    django.setup()
+
+    from django.apps import apps
+    from django_tortoise.models import tortoise_setup, __init
+
+    tortoise_setup(apps)
+    if loop is None:
+        asyncio.run(__init())
+    else:
+        loop.run_until_complete(__init())
+
+
+def get_db_backend():
+    from django_tortoise import models
+    return models.DB_BACKEND
+
+
+def get_model_a_row(db_backend):
+    from django.utils import timezone
+
+    now = timezone.now()
+    return {
+        'id': 1,
+        'binary': b'binary',
+        'boolean': True,
+        'char': 'char',
+        'date': now.date(),
+        'datetime': now,
+        'decimal': decimal.Decimal('1.12345678'),
+        'duration': 1_000_000 if db_backend == 'sqlite3' else datetime.timedelta(seconds=1),
+        'float': 1.5,
+        'ip': '127.0.0.1',
+        'integer': 1,
+        'small_int': 1,
+        'json': '{"name": "name"}',
+        'positive_big_int': 1,
+        'positive_int': 1,
+        'positive_small_int': 1,
+        'slug': 'slug',
+        'text': 'text',
+        'time': now.time(),
+        'url': 'https://example.com',
+        'uuid': str(uuid.uuid4()),
+    }
+
+
+def get_model_a_kwargs(i):
+    return {
+        'binary': f'binary {i}'.encode(),
+        'boolean': bool(i % 2),
+        'char': f'char {i}',
+        'decimal': decimal.Decimal(i % 100) / 7,
+        'duration': datetime.timedelta(seconds=i),
+        'float': i / 3,
+        'ip': f'10.0.{i // 256 % 256}.{i % 256}',
+        'integer': i,
+        'small_int': i % 32767,
+        'json': {'name': f'name {i}', 'points': i},
+        'positive_big_int': i,
+        'positive_int': i,
+        'positive_small_int': i % 32767,
+        'slug': f'slug-{i}',
+        'text': f'text {i} ' * 10,
+        'url': f'https://example.com/{i}',
+        'uuid': uuid.UUID(int=i),
+    }
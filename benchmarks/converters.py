@@ -0,0 +1,197 @@
+"""
+Per-row cost of converting ModelA values with the legacy (per-value settings lookups) and compiled field converters.
+
+    $ cd tests
+    $ DJANGO_SETTINGS_MODULE=proj.settings DJANGO_DATABASE_FOR_TEST=sqlite3 python ../benchmarks/converters.py
+"""
+import argparse
+import datetime
+import timeit
+import warnings
+
+from common import get_db_backend, get_model_a_row, setup
+
+
+# to_python_value of the fields before their converters were compiled, the baseline the compiled ones are
+# compared with: settings, DB_BACKEND and the django version are looked up for every value
+
+
+def legacy_date_to_python_value(field, value):
+    from django.conf import settings
+    from django.utils import timezone
+    from django.utils.dateparse import parse_date
+
+    if value is None:
+        return value
+    if isinstance(value, datetime.datetime):
+        if settings.USE_TZ and timezone.is_aware(value):
+            default_timezone = timezone.get_default_timezone()
+            value = timezone.make_naive(value, default_timezone)
+        value = value.date()
+        field.validate(value)
+        return value
+    if isinstance(value, datetime.date):
+        field.validate(value)
+        return value
+
+    parsed = parse_date(value)
+    if parsed is not None:
+        field.validate(parsed)
+        return parsed
+
+    raise ValueError(f'Bad value: {value}')
+
+
+def legacy_datetime_to_python_value(field, value):
+    import django
+    from django.conf import settings
+    from django.utils import timezone
+    from django.utils.dateparse import parse_date, parse_datetime
+
+    if value is None:
+        return value
+    if isinstance(value, datetime.datetime):
+        if settings.USE_TZ:
+            from django_tortoise.models import DB_BACKEND
+            if DB_BACKEND == 'sqlite3':
+                pass
+            elif DB_BACKEND == 'postgresql':
+
+                if django.VERSION[:2] >= (4, 1):
+                    default_timezone = timezone.get_default_timezone()
+                else:
+                    default_timezone = timezone.utc
+
+                value = value.astimezone(default_timezone)
+        else:
+            if timezone.is_aware(value):
+                value = timezone.make_naive(value)
+        field.validate(value)
+        return value
+    if isinstance(value, datetime.date):
+        value = datetime.datetime(value.year, value.month, value.day)
+        if settings.USE_TZ:
+            warnings.warn(
+                "DateTimeField %s.%s received a naive datetime "
+                "(%s) while time zone support is active."
+                % (field.model.__name__, field.model_field_name, value),
+                RuntimeWarning,
+            )
+            default_timezone = timezone.get_default_timezone()
+            value = timezone.make_aware(value, default_timezone)
+
+        field.validate(value)
+        return value
+
+    try:
+        parsed = parse_datetime(value)
+        if parsed is not None:
+            if settings.USE_TZ and timezone.is_naive(parsed):
+                if django.VERSION[:2] >= (4, 1):
+                    default_timezone = timezone.get_default_timezone()
+                else:
+                    default_timezone = timezone.utc
+                parsed = timezone.make_aware(parsed, default_timezone)
+            field.validate(parsed)
+            return parsed
+    except ValueError as e:
+        raise ValueError(f'Bad value: {value}') from e
+
+    try:
+        parsed = parse_date(value)
+        if parsed is not None:
+            value = datetime.datetime(parsed.year, parsed.month, parsed.day)
+            field.validate(value)
+            return value
+
+    except ValueError as e:
+        raise ValueError(f'Bad value: {value}') from e
+
+    raise ValueError(f'Bad value: {value}')
+
+
+def legacy_time_to_python_value(field, value):
+    from django.utils.dateparse import parse_time
+
+    if value is None:
+        return None
+    if isinstance(value, datetime.time):
+        field.validate(value)
+        return value
+    if isinstance(value, datetime.datetime):
+        value = value.time()
+        field.validate(value)
+        return value
+
+    try:
+        parsed = parse_time(value)
+        if parsed is not None:
+            field.validate(parsed)
+            return parsed
+    except ValueError as e:
+        raise ValueError(f'Bad value: {value}') from e
+
+    raise ValueError(f'Bad value: {value}')
+
+
+def legacy_duration_to_python_value(field, value):
+    from django.utils.dateparse import parse_duration
+
+    if value is None or isinstance(value, datetime.timedelta):
+        return value
+    elif isinstance(value, int):
+        return datetime.timedelta(microseconds=value)
+
+    try:
+        parsed = parse_duration(value)
+    except ValueError:
+        pass
+    else:
+        if parsed is not None:
+            return parsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100_000)
+    args = parser.parse_args()
+
+    setup()
+
+    from test_app_a.models import ModelA
+    fields_map = ModelA.abjects._meta.fields_map
+    db_backend = get_db_backend()
+    row = get_model_a_row(db_backend)
+    all_fields = [(fields_map[name], value) for name, value in row.items()]
+    compiled_fields = [(field, value) for field, value in all_fields if hasattr(field, 'compile_converters')]
+
+    from django_tortoise import fields as fields_module
+    legacy_to_python_values = {
+        fields_module.DateField: legacy_date_to_python_value,
+        fields_module.DateTimeField: legacy_datetime_to_python_value,
+        fields_module.TimeField: legacy_time_to_python_value,
+        fields_module.DurationField: legacy_duration_to_python_value,
+    }
+
+    for fields_name, fields in (('all fields', all_fields), ('compiled fields', compiled_fields)):
+        legacy_fields = [
+            (legacy_to_python_values.get(type(field), type(field).to_python_value), field, value)
+            for field, value in fields
+        ]
+
+        def convert_legacy():
+            for to_python_value, field, value in legacy_fields:
+                to_python_value(field, value)
+
+        def convert_compiled():
+            for field, value in fields:
+                field.to_python_value(value)
+
+        print(f'{fields_name} ({len(fields)}), {args.rows} rows, {db_backend}:')
+        for name, convert in (('legacy', convert_legacy), ('compiled', convert_compiled)):
+            seconds = min(timeit.repeat(convert, number=args.rows, repeat=5))
+            print(f'{name:>10}: {seconds / args.rows * 1e6:.2f} us/row')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+"""
+Cost of building ModelA instances from a result batch row by row and column by column.
+
+    $ cd tests
+    $ DJANGO_SETTINGS_MODULE=proj.settings DJANGO_DATABASE_FOR_TEST=sqlite3 python ../benchmarks/hydration.py
+"""
+import argparse
+import timeit
+
+from common import get_db_backend, get_model_a_row, setup
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10_000)
+    args = parser.parse_args()
+
+    setup()
+
+    from django_tortoise.backends.base import hydrate
+    from test_app_a.models import ModelA
+
+    model = ModelA.abjects
+    db_backend = get_db_backend()
+    rows = [get_model_a_row(db_backend) for _ in range(args.rows)]
+
+    def hydrate_by_rows():
+        return [model._init_from_db(**row) for row in rows]
+
+    def hydrate_by_columns():
+        return hydrate(model, rows)
+
+    print(f'ModelA, {args.rows} rows, {db_backend}:')
+    for name, build in (('rows', hydrate_by_rows), ('columns', hydrate_by_columns)):
+        seconds = min(timeit.repeat(build, number=1, repeat=5))
+        print(f'{name:>10}: {seconds / args.rows * 1e6:.2f} us/row')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+"""
+Latency, throughput and memory of Django ORM (objects) and Tortoise ORM (abjects) queries.
+
+    $ cd tests
+    $ python manage.py migrate
+    $ DJANGO_SETTINGS_MODULE=proj.settings DJANGO_DATABASE_FOR_TEST=sqlite3 python ../benchmarks/orm.py --output orm.json
+
+Rows created for the benchmark are deleted when it finishes.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+from common import get_db_backend, get_model_a_kwargs, setup
+
+
+def get_scenarios(model_a_ids, model_a_rel_ids, batch_size):
+    from test_app_a.models import ModelA, ModelARel
+
+    def get_model_a_id():
+        return random.choice(model_a_ids)
+
+    def bulk_create_django():
+        ModelA.objects.bulk_create([ModelA(**get_model_a_kwargs(i)) for i in range(batch_size)])
+
+    async def bulk_create_tortoise():
+        await ModelA.abjects.bulk_create([ModelA.abjects(**get_model_a_kwargs(i)) for i in range(batch_size)])
+
+    return {
+        'get': (
+            lambda: ModelA.objects.get(id=get_model_a_id()),
+            lambda: ModelA.abjects.get(id=get_model_a_id()),
+        ),
+        'filter': (
+            lambda: list(ModelA.objects.filter(id__in=model_a_ids)[:batch_size]),
+            lambda: ModelA.abjects.filter(id__in=model_a_ids).limit(batch_size),
+        ),
+        'bulk_create': (
+            bulk_create_django,
+            bulk_create_tortoise,
+        ),
+        'update': (
+            lambda: ModelA.objects.filter(id=get_model_a_id()).update(char='updated'),
+            lambda: ModelA.abjects.filter(id=get_model_a_id()).update(char='updated'),
+        ),
+        'm2m_fetch': (
+            lambda: list(ModelARel.objects.filter(id__in=model_a_rel_ids).prefetch_related('many')),
+            lambda: ModelARel.abjects.filter(id__in=model_a_rel_ids).prefetch_related('many'),
+        ),
+        'fk_prefetch': (
+            lambda: list(ModelARel.objects.filter(id__in=model_a_rel_ids).prefetch_related('foreign')),
+            lambda: ModelARel.abjects.filter(id__in=model_a_rel_ids).prefetch_related('foreign'),
+        ),
+    }
+
+
+def create_dataset(size):
+    from test_app_a.models import ModelA, ModelARel
+
+    ModelA.objects.bulk_create([ModelA(**get_model_a_kwargs(i)) for i in range(size * 2)])
+    model_a_ids = [model_a.id for model_a in ModelA.objects.order_by('-id')[:size * 2]]
+
+    model_a_rel_ids = []
+    for one_id, foreign_id in zip(model_a_ids[:size], model_a_ids[size:]):
+        model_a_rel = ModelARel.objects.create(one_id=one_id, foreign_id=foreign_id)
+        model_a_rel.many.add(*random.sample(model_a_ids, 3))
+        model_a_rel_ids.append(model_a_rel.id)
+
+    return model_a_ids, model_a_rel_ids
+
+
+def summarize(scenario, orm, latencies, peak_memory):
+    latencies_ms = sorted(latency * 1000 for latency in latencies)
+    percentiles = statistics.quantiles(latencies_ms, n=100, method='inclusive')
+    return {
+        'scenario': scenario,
+        'orm': orm,
+        'iterations': len(latencies_ms),
+        'mean_ms': statistics.fmean(latencies_ms),
+        'p50_ms': percentiles[49],
+        'p90_ms': percentiles[89],
+        'p99_ms': percentiles[98],
+        'ops_per_second': len(latencies_ms) / sum(latencies_ms) * 1000,
+        'peak_memory_kib': peak_memory / 1024,
+    }
+
+
+def measure_django(call, iterations, memory_iterations):
+    latencies = []
+    for _ in range(iterations):
+        started_at = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - started_at)
+
+    tracemalloc.start()
+    for _ in range(memory_iterations):
+        call()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return latencies, peak_memory
+
+
+async def measure_tortoise(call, iterations, memory_iterations):
+    latencies = []
+    for _ in range(iterations):
+        started_at = time.perf_counter()
+        await call()
+        latencies.append(time.perf_counter() - started_at)
+
+    tracemalloc.start()
+    for _ in range(memory_iterations):
+        await call()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return latencies, peak_memory
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--memory-iterations', type=int, default=10)
+    parser.add_argument('--dataset-size', type=int, default=200)
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument('--scenario', action='append', help='run the given scenarios only')
+    parser.add_argument('--output', help='write JSON results to the file instead of stdout')
+    args = parser.parse_args()
+
+    random.seed(0)
+    loop = asyncio.new_event_loop()
+    setup(loop)
+
+    import django
+    import tortoise
+    from tortoise import Tortoise
+    from test_app_a.models import ModelA
+
+    max_id = ModelA.objects.order_by('-id').values_list('id', flat=True).first() or 0
+    model_a_ids, model_a_rel_ids = create_dataset(args.dataset_size)
+    scenarios = get_scenarios(model_a_ids, model_a_rel_ids, args.batch_size)
+
+    results = []
+    try:
+        for scenario, (django_call, tortoise_call) in scenarios.items():
+            if args.scenario and scenario not in args.scenario:
+                continue
+
+            latencies, peak_memory = measure_django(django_call, args.iterations, args.memory_iterations)
+            results.append(summarize(scenario, 'django', latencies, peak_memory))
+
+            latencies, peak_memory = loop.run_until_complete(
+                measure_tortoise(tortoise_call, args.iterations, args.memory_iterations)
+            )
+            results.append(summarize(scenario, 'tortoise', latencies, peak_memory))
+
+            for result in results[-2:]:
+                print(
+                    f'{scenario:>12} {result["orm"]:>8}: p50 {result["p50_ms"]:.3f} ms, '
+                    f'p99 {result["p99_ms"]:.3f} ms, {result["ops_per_second"]:.0f} ops/s, '
+                    f'peak {result["peak_memory_kib"]:.0f} KiB',
+                    file=sys.stderr,
+                )
+    finally:
+        # cascades to ModelARel rows
+        ModelA.objects.filter(id__gt=max_id).delete()
+        loop.run_until_complete(Tortoise.close_connections())
+        loop.close()
+
+    report = json.dumps({
+        'db_backend': get_db_backend(),
+        'python': platform.python_version(),
+        'django': django.__version__,
+        'tortoise': tortoise.__version__,
+        'arguments': vars(args),
+        'results': results,
+    }, indent=2)
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            output.write(report)
+    else:
+        print(report)
+
+
+if __name__ == '__main__':
+    main()
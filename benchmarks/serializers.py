@@ -0,0 +1,58 @@
+"""
+Per-instance cost of serializing ModelA with the hand-written and the compiled serializers.
+
+    $ cd tests
+    $ DJANGO_SETTINGS_MODULE=proj.settings DJANGO_DATABASE_FOR_TEST=sqlite3 python ../benchmarks/serializers.py
+"""
+import argparse
+import json
+import timeit
+
+from common import get_db_backend, get_model_a_row, setup
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10_000)
+    args = parser.parse_args()
+
+    setup()
+
+    from django.core.serializers.json import DjangoJSONEncoder
+    from django_tortoise.backends.base import hydrate
+    from django_tortoise.serializers import get_serializer
+    from test_app_a.models import ModelA
+    from test_app_a.serializers import serialize_model_a
+
+    db_backend = get_db_backend()
+    instances = hydrate(ModelA.abjects, [get_model_a_row(db_backend) for _ in range(args.rows)])
+    serialize = get_serializer(ModelA)
+    serialize_json = get_serializer(ModelA, json=True)
+
+    def to_dict_manual():
+        return [serialize_model_a(instance) for instance in instances]
+
+    def to_dict_compiled():
+        return [serialize(instance) for instance in instances]
+
+    def to_json_manual():
+        # bytes are not supported by DjangoJSONEncoder
+        rows = [{**serialize_model_a(instance), 'binary': None} for instance in instances]
+        return json.dumps(rows, cls=DjangoJSONEncoder)
+
+    def to_json_compiled():
+        return json.dumps([serialize_json(instance) for instance in instances])
+
+    print(f'ModelA, {args.rows} instances, {db_backend}:')
+    for name, run in (
+        ('dict, manual', to_dict_manual),
+        ('dict, compiled', to_dict_compiled),
+        ('json, manual', to_json_manual),
+        ('json, compiled', to_json_compiled),
+    ):
+        seconds = min(timeit.repeat(run, number=1, repeat=5))
+        print(f'{name:>15}: {seconds / args.rows * 1e6:.2f} us/instance')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Boot time of patching models lazily and of generating every Tortoise model at startup, as before.
+
+    $ cd tests
+    $ DJANGO_SETTINGS_MODULE=proj.settings DJANGO_DATABASE_FOR_TEST=sqlite3 python ../benchmarks/startup.py
+"""
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+
+import common  # noqa: F401, puts the package and the test project on sys.path
+
+
+def boot(eager):
+    import django
+    django.setup()
+
+    from django.apps import apps
+    from tortoise import Tortoise
+    from django_tortoise.models import TORTOISE_MODELS, tortoise_setup, __init
+
+    async def init():
+        await __init()
+        await Tortoise.close_connections()
+
+    started_at = time.perf_counter()
+    tortoise_setup(apps)
+    if eager:
+        # models generated before initialization are registered together, as the eager setup did
+        for django_model in apps.get_models():
+            getattr(django_model, 'abjects', None)
+    asyncio.run(init())
+
+    return {'seconds': time.perf_counter() - started_at, 'models': len(TORTOISE_MODELS)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--boot', choices=('lazy', 'eager'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.boot:
+        print(json.dumps(boot(args.boot == 'eager')))
+        return
+
+    # every boot runs in a fresh process, so nothing is generated or imported already
+    print(f'tortoise_setup() and Tortoise initialization, best of {args.repeat} processes:')
+    for mode in ('eager', 'lazy'):
+        results = [
+            json.loads(subprocess.run(
+                [sys.executable, __file__, '--boot', mode], check=True, capture_output=True, text=True
+            ).stdout)
+            for _ in range(args.repeat)
+        ]
+        seconds = min(result['seconds'] for result in results)
+        print(f'{mode:>10}: {seconds * 1000:.2f} ms, {results[0]["models"]} models generated')
+
+
+if __name__ == '__main__':
+    main()
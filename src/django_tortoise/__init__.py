@@ -1,4 +1,4 @@
-from .asgi import get_boosted_asgi_application
+from .asgi import get_boosted_asgi_application, LoaderMiddleware
 from .models import run_async
 
 __author__ = """Denys Kharyna"""
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class DjangoTortoiseConfig(AppConfig):
     name = 'django_tortoise'
     verbose_name = 'django-tortoise'
+
+    def ready(self):
+        # django writes invalidate cached abjects results even if tortoise is never initialized here
+        from . import cache  # noqa: F401
@@ -1,6 +1,80 @@
+import django
+from asgiref.sync import sync_to_async
 from django.core.handlers.asgi import ASGIHandler
 
-from .models import tortoise_setup, tortoise_init
+from .connections import close_connections, open_connections, use_connections
+from .loaders import batched_loads
+from .models import tortoise_setup
+
+
+class BoostedASGIHandler:
+    def __init__(self, app):
+        self.app = app
+
+        if django.VERSION < (4, 2) and isinstance(app, ASGIHandler):
+            # django iterates async streaming content itself since 4.2
+            send_response = app.send_response
+            app.send_response = lambda response, send: _send_response(app, send_response, response, send)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self.lifespan(receive, send)
+
+        # the event loop of the request owns its own connections
+        await use_connections()
+        return await self.app(scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+
+            if message['type'] == 'lifespan.startup':
+                try:
+                    await open_connections()
+                except Exception as e:
+                    await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                    raise
+                await send({'type': 'lifespan.startup.complete'})
+
+            elif message['type'] == 'lifespan.shutdown':
+                try:
+                    await close_connections()
+                except Exception as e:
+                    await send({'type': 'lifespan.shutdown.failed', 'message': str(e)})
+                    raise
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+async def _send_response(handler, send_response, response, send):
+    if not hasattr(response, '__aiter__'):
+        return await send_response(response, send)
+
+    headers = [(header.encode('ascii'), value.encode('latin1')) for header, value in response.items()]
+    for cookie in response.cookies.values():
+        headers.append((b'Set-Cookie', cookie.output(header='').encode('ascii').strip()))
+    await send({'type': 'http.response.start', 'status': response.status_code, 'headers': headers})
+
+    # ASGI servers return from send() when the body can be written, which paces the iteration
+    async for part in response:
+        for chunk, _ in handler.chunk_bytes(part):
+            await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+    await send({'type': 'http.response.body'})
+
+    await sync_to_async(response.close, thread_sensitive=True)()
+
+
+class LoaderMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self.app(scope, receive, send)
+
+        # concurrent lookups by primary key within the request are batched into one query per model
+        with batched_loads():
+            return await self.app(scope, receive, send)
 
 
 def get_boosted_asgi_application(app):
@@ -9,6 +83,5 @@ def get_boosted_asgi_application(app):
 
     from django.apps import apps
     tortoise_setup(apps)
-    tortoise_init()
 
-    return app
+    return BoostedASGIHandler(app)
@@ -0,0 +1,108 @@
+import asyncpg
+from tortoise.backends.asyncpg.client import (
+    AsyncpgDBClient as TortoiseAsyncpgDBClient,
+    TransactionWrapper as TortoiseTransactionWrapper,
+)
+from tortoise.backends.asyncpg.executor import AsyncpgExecutor as TortoiseAsyncpgExecutor
+from tortoise.backends.base.client import TransactionContextPooled
+
+from ..cache import ainvalidate_tables
+from ..instrumentation import instrument
+from .base import (
+    CacheInvalidatingClientMixin,
+    CacheInvalidatingTransactionMixin,
+    get_db_records,
+    HydratingExecutorMixin,
+    InstrumentedClientMixin,
+    UpsertExecutorMixin,
+)
+
+
+class AsyncpgExecutor(HydratingExecutorMixin, UpsertExecutorMixin, TortoiseAsyncpgExecutor):
+    async def stream_select(self, query, custom_fields, chunk_size):
+        if len(self.select_related_idx or ()) > 1:
+            raise ValueError('Querysets with select_related() cannot be streamed')
+
+        async with self.db.acquire_connection() as connection:
+            # server-side cursors exist within a transaction only
+            async with connection.transaction():
+                cursor = await connection.cursor(query.get_sql())
+                while True:
+                    rows = await cursor.fetch(chunk_size)
+                    if not rows:
+                        return
+                    yield await self._hydrate_rows(rows, custom_fields)
+
+    async def execute_copy(self, instances):
+        meta = self.model._meta
+
+        # generated primary keys are left to the database
+        records = get_db_records(self, instances, self.regular_columns)
+        columns = [meta.fields_db_projection[name] for name in self.regular_columns]
+        await self._copy_records(meta.db_table, columns, records, meta.schema or None)
+        await ainvalidate_tables({meta.db_table})
+
+    async def _copy_records(self, table, columns, records, schema=None):
+        async def execute():
+            async with self.db.acquire_connection() as connection:
+                return await connection.copy_records_to_table(
+                    table, records=records, columns=columns, schema_name=schema
+                )
+
+        sql = f'COPY "{table}" ({", ".join(columns)}) FROM STDIN (FORMAT binary)'
+        await instrument(self.db.connection_name, execute, sql, None, lambda _: len(records))
+
+    async def _load_staging_table(self, staging_table, columns, records):
+        await self._copy_records(staging_table, columns, records)
+
+    async def _merge_staging_table(self, staging_table, conflict_column, merge_sql, staged):
+        # xmax of a row is 0 unless the statement updated it
+        _, rows = await self.db.execute_query(f'{merge_sql} RETURNING (xmax = 0) AS inserted')
+        inserted = sum(row['inserted'] for row in rows)
+        return inserted, len(rows) - inserted
+
+
+# options of asyncpg.create_pool() only
+POOL_OPTIONS = ('min_size', 'max_size', 'max_queries', 'max_inactive_connection_lifetime', 'setup', 'init', 'loop')
+
+
+# the binary format of jsonb is a version byte followed by the JSON text
+JSONB_VERSION = b'\x01'
+
+
+def encode_jsonb(value):
+    return JSONB_VERSION + (value if value.__class__ is bytes else value.encode())
+
+
+def decode_jsonb(data):
+    # JSONField decodes the utf-8 text itself, on the first access with LAZY_JSON
+    return data[1:]
+
+
+class AsyncpgDBClient(InstrumentedClientMixin, CacheInvalidatingClientMixin, TortoiseAsyncpgDBClient):
+    executor_class = AsyncpgExecutor
+
+    async def create_pool(self, init=None, **kwargs):
+        async def init_connection(connection):
+            await connection.set_type_codec(
+                'jsonb', encoder=encode_jsonb, decoder=decode_jsonb, schema='pg_catalog', format='binary'
+            )
+            if init is not None:
+                await init(connection)
+
+        return await super().create_pool(init=init_connection, **kwargs)
+
+    async def create_dedicated_connection(self):
+        # the same options as pooled connections, e.g. for LISTEN
+        options = {option: value for option, value in self._template.items() if option not in POOL_OPTIONS}
+        return await asyncpg.connect(password=self.password, **options)
+
+    def _in_transaction(self):
+        return TransactionContextPooled(TransactionWrapper(self))
+
+
+class TransactionWrapper(InstrumentedClientMixin, CacheInvalidatingTransactionMixin, TortoiseTransactionWrapper):
+    executor_class = AsyncpgExecutor
+
+
+client_class = AsyncpgDBClient
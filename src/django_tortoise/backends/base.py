@@ -0,0 +1,226 @@
+from ..cache import ainvalidate_tables, fetch_rows, get_written_tables
+from ..deferred import BATCH, DeferredBatch, get_deferred_field_names
+from ..instrumentation import instrument, TimedConnectionWrapper
+
+
+def hydrate(model, rows, connection_name=None):
+    if not rows:
+        return []
+
+    meta = model._meta
+    # keys() of asyncpg records is a one-shot iterator
+    row_keys = set(rows[0].keys())
+    deferred = ()
+    if not all(key in row_keys for key in meta.db_fields):
+        deferred = get_deferred_field_names(model)
+        if not __is_deferred_row(meta, row_keys, deferred):
+            # partial rows (e.g. .only()) are rare, tortoise handles them
+            return [model._init_from_db(**row) for row in rows]
+
+    # every column is decoded once for the whole batch
+    columns = {}
+    for key, model_field, field in __get_row_fields(meta.db_native_fields, deferred):
+        columns[model_field] = [row[key] for row in rows]
+
+    for key, model_field, field in __get_row_fields(meta.db_default_fields, deferred):
+        field_type = field.field_type
+        columns[model_field] = [None if value is None else field_type(value) for value in (row[key] for row in rows)]
+
+    for key, model_field, field in __get_row_fields(meta.db_complex_fields, deferred):
+        values = [row[key] for row in rows]
+        to_python_values = getattr(field, 'to_python_values', None)
+        if to_python_values is not None:
+            columns[model_field] = to_python_values(values)
+        else:
+            columns[model_field] = list(map(field.to_python_value, values))
+
+    # the same state Model._init_from_db sets up
+    state = {
+        '_partial': False,
+        '_saved_in_db': True,
+        '_custom_generated_pk': meta.db_pk_column not in meta.generated_db_fields,
+    }
+    if deferred:
+        state[BATCH] = batch = DeferredBatch(connection_name)
+    model_fields = list(columns)
+    new = model.__new__
+
+    instances = []
+    for values in zip(*columns.values()):
+        instance = new(model)
+        instance_dict = instance.__dict__
+        instance_dict.update(state)
+        instance_dict.update(zip(model_fields, values))
+        instances.append(instance)
+
+    if deferred:
+        batch.instances = instances
+    return instances
+
+
+def __is_deferred_row(meta, row_keys, deferred):
+    # querysets select the fields which are not deferred by default like only() does
+    return bool(deferred) and all(
+        (name in deferred) != (name in row_keys) for name in meta.fields_db_projection
+    )
+
+
+def __get_row_fields(db_fields, deferred):
+    # rows selected by only() are keyed by field names
+    for key, model_field, field in db_fields:
+        if model_field not in deferred:
+            yield (model_field if deferred else key), model_field, field
+
+
+def get_db_records(executor, instances, field_names):
+    # the same conversions and validation as inserts
+    column_map = executor.column_map
+    return [[column_map[name](getattr(instance, name), instance) for name in field_names] for instance in instances]
+
+
+class HydratingExecutorMixin:
+    async def execute_select(self, query, custom_fields=None):
+        # the queried model itself is always the first item
+        if len(self.select_related_idx or ()) > 1:
+            return await super().execute_select(query, custom_fields)
+
+        sql = query.get_sql()
+
+        async def execute():
+            _, rows = await self.db.execute_query(sql)
+            return rows
+
+        raw_results = await fetch_rows(self.model, self.db.connection_name, sql, execute)
+        return await self._hydrate_rows(raw_results, custom_fields)
+
+    async def _hydrate_rows(self, rows, custom_fields=None):
+        instance_list = hydrate(self.model, rows, self.db.connection_name)
+
+        if custom_fields:
+            for instance, row in zip(instance_list, rows):
+                for field in custom_fields:
+                    setattr(instance, field, row[field])
+
+        await self._execute_prefetch_queries(instance_list)
+        return instance_list
+
+
+class UpsertExecutorMixin:
+    async def execute_upsert(self, instances, conflict_field, update_fields=None):
+        meta = self.model._meta
+        projection = meta.fields_db_projection
+
+        # generated primary keys are written only when they are the conflict target
+        field_names = self.regular_columns_all if meta.fields_map[conflict_field].generated else self.regular_columns
+        if update_fields is None:
+            update_fields = field_names
+
+        # the last duplicate wins since ON CONFLICT cannot update a row twice
+        deduplicated = {}
+        for instance in instances:
+            conflict_value = getattr(instance, conflict_field)
+            if conflict_value is None:
+                # e.g. unsaved instances upserted by their generated primary key
+                raise ValueError(f'{conflict_field} of upserted {self.model.__name__} instances cannot be None')
+            deduplicated[conflict_value] = instance
+        instances = list(deduplicated.values())
+        records = get_db_records(self, instances, field_names)
+
+        columns = ', '.join(f'"{projection[name]}"' for name in field_names)
+        staging_table = f'_upsert_{meta.db_table}'
+        await self.db.execute_script(
+            f'CREATE TEMP TABLE "{staging_table}" AS SELECT {columns} FROM "{meta.db_table}" WHERE 1 = 0'
+        )
+        await self._load_staging_table(staging_table, [projection[name] for name in field_names], records)
+
+        updates = ', '.join(
+            f'"{projection[name]}" = EXCLUDED."{projection[name]}"'
+            for name in update_fields
+            if name != conflict_field and not meta.fields_map[name].pk
+        )
+        conflict_column = projection[conflict_field]
+        merge_sql = (
+            f'INSERT INTO "{meta.db_table}" ({columns}) SELECT {columns} FROM "{staging_table}" WHERE true '
+            f'ON CONFLICT ("{conflict_column}") ' + (f'DO UPDATE SET {updates}' if updates else 'DO NOTHING')
+        )
+        inserted, updated = await self._merge_staging_table(staging_table, conflict_column, merge_sql, len(records))
+
+        await self.db.execute_script(f'DROP TABLE "{staging_table}"')
+        return inserted, updated if updates else 0
+
+    async def _load_staging_table(self, staging_table, columns, records):
+        quoted_columns = ', '.join(f'"{column}"' for column in columns)
+        placeholders = ', '.join('?' for _ in columns)
+        await self.db.execute_many(
+            f'INSERT INTO "{staging_table}" ({quoted_columns}) VALUES ({placeholders})', records
+        )
+
+    async def _merge_staging_table(self, staging_table, conflict_column, merge_sql, staged):
+        _, rows = await self.db.execute_query(
+            f'SELECT COUNT(*) FROM "{staging_table}" '
+            f'WHERE "{conflict_column}" IN (SELECT "{conflict_column}" FROM "{self.model._meta.db_table}")'
+        )
+        existing = rows[0][0]
+
+        await self.db.execute_query(merge_sql)
+        return staged - existing, existing
+
+
+class InstrumentedClientMixin:
+    def acquire_connection(self):
+        return TimedConnectionWrapper(super().acquire_connection())
+
+    async def execute_insert(self, query, values):
+        execute = super().execute_insert
+        return await instrument(self.connection_name, lambda: execute(query, values), query, values, lambda _: 1)
+
+    async def execute_many(self, query, values):
+        execute = super().execute_many
+        return await instrument(
+            self.connection_name, lambda: execute(query, values), query, values, lambda _: len(values)
+        )
+
+    async def execute_query(self, query, values=None):
+        execute = super().execute_query
+        return await instrument(
+            self.connection_name, lambda: execute(query, values), query, values, lambda result: result[0]
+        )
+
+    async def execute_query_dict(self, query, values=None):
+        execute = super().execute_query_dict
+        return await instrument(self.connection_name, lambda: execute(query, values), query, values, len)
+
+    async def execute_script(self, query):
+        execute = super().execute_script
+        return await instrument(self.connection_name, lambda: execute(query), query, None, lambda _: None)
+
+
+class CacheInvalidatingClientMixin:
+    async def execute_insert(self, query, values):
+        result = await super().execute_insert(query, values)
+        await self._invalidate_written_tables(query)
+        return result
+
+    async def execute_many(self, query, values):
+        result = await super().execute_many(query, values)
+        await self._invalidate_written_tables(query)
+        return result
+
+    async def execute_query(self, query, values=None):
+        result = await super().execute_query(query, values)
+        await self._invalidate_written_tables(query)
+        return result
+
+    async def _invalidate_written_tables(self, query):
+        await ainvalidate_tables(get_written_tables(query))
+
+
+class CacheInvalidatingTransactionMixin(CacheInvalidatingClientMixin):
+    async def _invalidate_written_tables(self, query):
+        await super()._invalidate_written_tables(query)
+        self.__dict__.setdefault('_written_tables', set()).update(get_written_tables(query))
+
+    async def commit(self):
+        await super().commit()
+        # the old rows can be cached again until the transaction is committed
+        await ainvalidate_tables(self.__dict__.pop('_written_tables', set()))
@@ -0,0 +1,123 @@
+import asyncio
+import os
+import re
+import sqlite3
+from contextvars import ContextVar
+from urllib.parse import quote
+
+import aiosqlite
+from tortoise.backends.base.client import TransactionContext
+from tortoise.backends.sqlite.client import (
+    SqliteClient as TortoiseSqliteClient,
+    TransactionWrapper as TortoiseTransactionWrapper,
+)
+from tortoise.backends.sqlite.executor import SqliteExecutor as TortoiseSqliteExecutor
+
+from .base import (
+    CacheInvalidatingClientMixin,
+    CacheInvalidatingTransactionMixin,
+    HydratingExecutorMixin,
+    InstrumentedClientMixin,
+    UpsertExecutorMixin,
+)
+
+
+class SqliteExecutor(HydratingExecutorMixin, UpsertExecutorMixin, TortoiseSqliteExecutor):
+    async def execute_copy(self, instances):
+        # sqlite has no COPY, a single executemany is the closest
+        await self.execute_bulk_insert(instances)
+
+
+READ_QUERY = re.compile(r'^\s*SELECT\b', re.IGNORECASE)
+
+# pragmas changing the database file, a read-only connection cannot set them
+WRITER_PRAGMAS = ('journal_mode', 'journal_size_limit')
+
+_reading = ContextVar('reading', default=False)
+
+
+class ReadConnectionWrapper:
+    __slots__ = ('readers', 'connection')
+
+    def __init__(self, readers):
+        self.readers = readers
+        self.connection = None
+
+    async def __aenter__(self):
+        self.connection = await self.readers.get()
+        return self.connection
+
+    async def __aexit__(self, *exc_info):
+        self.readers.put_nowait(self.connection)
+
+
+class ReadPoolClientMixin:
+    # selects outside transactions run on a pool of read-only connections, which WAL lets read concurrently
+    # with the single writer connection; writers queue on the lock of the writer connection
+
+    def __init__(self, file_path, read_pool_size=0, **kwargs):
+        super().__init__(file_path, **kwargs)
+        self.read_pool_size = read_pool_size
+        self._readers = None
+
+    async def create_connection(self, with_db):
+        await super().create_connection(with_db)
+
+        if self.read_pool_size and self._readers is None and not self.__is_memory_database():
+            readers = asyncio.Queue()
+            for _ in range(self.read_pool_size):
+                readers.put_nowait(await self.__connect_reader())
+            self._readers = readers
+
+    def __is_memory_database(self):
+        return self.filename == ':memory:' or 'mode=memory' in self.filename
+
+    async def __connect_reader(self):
+        uri = f'file:{quote(os.path.abspath(self.filename))}?mode=ro'
+        connection = await aiosqlite.connect(uri, uri=True, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        for pragma, value in self.pragmas.items():
+            if pragma not in WRITER_PRAGMAS:
+                cursor = await connection.execute(f'PRAGMA {pragma}={value}')
+                await cursor.close()
+        return connection
+
+    async def close(self):
+        await super().close()
+
+        readers, self._readers = self._readers, None
+        while readers is not None and not readers.empty():
+            await readers.get_nowait().close()
+
+    def acquire_connection(self):
+        if self._readers is not None and _reading.get():
+            return ReadConnectionWrapper(self._readers)
+        return super().acquire_connection()
+
+    async def execute_query(self, query, values=None):
+        token = _reading.set(bool(READ_QUERY.match(query)))
+        try:
+            return await super().execute_query(query, values)
+        finally:
+            _reading.reset(token)
+
+    async def execute_query_dict(self, query, values=None):
+        token = _reading.set(bool(READ_QUERY.match(query)))
+        try:
+            return await super().execute_query_dict(query, values)
+        finally:
+            _reading.reset(token)
+
+
+class SqliteClient(InstrumentedClientMixin, CacheInvalidatingClientMixin, ReadPoolClientMixin, TortoiseSqliteClient):
+    executor_class = SqliteExecutor
+
+    def _in_transaction(self):
+        return TransactionContext(TransactionWrapper(self))
+
+
+class TransactionWrapper(InstrumentedClientMixin, CacheInvalidatingTransactionMixin, TortoiseTransactionWrapper):
+    executor_class = SqliteExecutor
+
+
+client_class = SqliteClient
@@ -0,0 +1,219 @@
+import abc
+import asyncio
+import inspect
+import logging
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections as django_connections, DEFAULT_DB_ALIAS
+from django.utils.module_loading import import_string
+
+from .conf import get_setting
+
+
+logger = logging.getLogger('django_tortoise')
+
+_buses = {}  # dotted path -> invalidation bus of the process
+
+
+def get_invalidation_bus():
+    path = get_setting('INVALIDATION_BUS')
+    if path is None:
+        return None
+
+    try:
+        return _buses[path]
+    except KeyError:
+        return _buses.setdefault(path, import_string(path)())
+
+
+def publish_invalidation(tables):
+    bus = get_invalidation_bus()
+    if bus is not None:
+        bus.publish(tables)
+
+
+async def apublish_invalidation(tables):
+    bus = get_invalidation_bus()
+    if bus is not None:
+        await bus.apublish(tables)
+
+
+async def _invalidate_locally(tables):
+    from .cache import ainvalidate_tables
+
+    await ainvalidate_tables(tables, publish=False)
+
+
+class _Coalescer:
+    def __init__(self, loop, delay, callback):
+        self.loop = loop
+        self.delay = delay
+        self.callback = callback
+        self.pending = set()
+        self.timer = None
+        self.tasks = set()
+
+    def add(self, tables):
+        self.pending.update(tables)
+        if self.timer is None:
+            self.timer = self.loop.call_later(self.delay, self.__flush_later)
+
+    def __flush_later(self):
+        task = self.loop.create_task(self.flush())
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def flush(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+
+        tables, self.pending = self.pending, set()
+        if not tables:
+            return
+
+        try:
+            result = self.callback(tables)
+            if inspect.isawaitable(result):
+                await result
+        except Exception:
+            logger.exception('Invalidation of %s failed', ', '.join(sorted(tables)))
+
+
+class InvalidationBus(abc.ABC):
+    def __init__(self, on_invalidate=None):
+        self.on_invalidate = on_invalidate or _invalidate_locally
+        self.loop = None
+        self._outgoing = self._incoming = None
+        self._tasks = set()
+
+    async def start(self, client=None):
+        self.loop = asyncio.get_running_loop()
+
+        # a burst of writes (e.g. a bulk import) ends up in a single message
+        delay = get_setting('INVALIDATION_DELAY')
+        self._outgoing = _Coalescer(self.loop, delay, self._send)
+        self._incoming = _Coalescer(self.loop, delay, self.on_invalidate)
+
+        await self._subscribe(client)
+
+    async def stop(self):
+        await self._outgoing.flush()
+        await self._incoming.flush()
+        await self._unsubscribe()
+        self.loop = None
+
+    def publish(self, tables):
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        if self.loop is None:
+            if running_loop is None:
+                # e.g. django writes of a WSGI worker or a management command
+                self._send_now(tables)
+            else:
+                task = running_loop.create_task(self._asend_now(tables))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+        elif running_loop is self.loop:
+            self._outgoing.add(tables)
+        else:
+            self.loop.call_soon_threadsafe(self._outgoing.add, tables)
+
+    async def apublish(self, tables):
+        if self.loop is None:
+            # e.g. writes of an event loop the bus was not started with
+            await self._asend_now(tables)
+        else:
+            self.publish(tables)
+
+    def receive(self, tables):
+        self._incoming.add(tables)
+
+    @abc.abstractmethod
+    async def _subscribe(self, client):
+        pass
+
+    @abc.abstractmethod
+    async def _unsubscribe(self):
+        pass
+
+    @abc.abstractmethod
+    async def _send(self, tables):
+        pass
+
+    @abc.abstractmethod
+    def _send_now(self, tables):
+        pass
+
+    async def _asend_now(self, tables):
+        # _send_now() may block, e.g. on a django connection
+        await sync_to_async(self._send_now)(tables)
+
+
+def get_payloads(tables, max_length=7900):
+    # NOTIFY payloads must be shorter than 8000 bytes
+    payload = []
+    for table in sorted(tables):
+        if payload and len(','.join([*payload, table])) > max_length:
+            yield ','.join(payload)
+            payload = []
+        payload.append(table)
+
+    if payload:
+        yield ','.join(payload)
+
+
+class PostgresInvalidationBus(InvalidationBus):
+    _connection = None
+
+    async def _subscribe(self, client):
+        if not hasattr(client, 'create_dedicated_connection'):
+            raise ImproperlyConfigured('PostgresInvalidationBus requires a PostgreSQL database')
+
+        # LISTEN holds its connection forever, so it must not come from the pool
+        self._connection = await client.create_dedicated_connection()
+        await self._connection.add_listener(get_setting('INVALIDATION_CHANNEL'), self.__on_notification)
+
+    def __on_notification(self, connection, pid, channel, payload):
+        # writes of this worker are invalidated already
+        if pid != connection.get_server_pid():
+            self.receive(payload.split(','))
+
+    async def _unsubscribe(self):
+        await self._connection.close()
+        self._connection = None
+
+    async def _send(self, tables):
+        channel = get_setting('INVALIDATION_CHANNEL')
+        for payload in get_payloads(tables):
+            await self._connection.execute('SELECT pg_notify($1, $2)', channel, payload)
+
+    def _send_now(self, tables):
+        # notifications are delivered on commit of the surrounding django transaction
+        channel = get_setting('INVALIDATION_CHANNEL')
+        with django_connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+            for payload in get_payloads(tables):
+                cursor.execute('SELECT pg_notify(%s, %s)', [channel, payload])
+
+
+class LocalInvalidationBus(InvalidationBus):
+    # stands in for PostgreSQL in tests and development, every started bus acts as a separate worker
+    subscribers = []
+
+    async def _subscribe(self, client):
+        self.subscribers.append(self)
+
+    async def _unsubscribe(self):
+        self.subscribers.remove(self)
+
+    async def _send(self, tables):
+        self._send_now(tables)
+
+    def _send_now(self, tables):
+        for bus in list(self.subscribers):
+            if bus is not self:
+                bus.loop.call_soon_threadsafe(bus.receive, set(tables))
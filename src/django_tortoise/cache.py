@@ -0,0 +1,135 @@
+import hashlib
+import re
+import uuid
+from collections import OrderedDict
+
+import django
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .bus import apublish_invalidation, publish_invalidation
+from .conf import get_setting
+from .models import DJANGO_MODELS
+
+
+KEY_PREFIX = 'django_tortoise'
+
+READ_TABLES = re.compile(r'\b(?:FROM|JOIN)\s+["`]?(\w+)', re.IGNORECASE)
+WRITE_TABLE = re.compile(r'^\s*(?:INSERT\s+(?:OR\s+\w+\s+)?INTO|UPDATE|DELETE\s+FROM)\s+["`]?(\w+)', re.IGNORECASE)
+
+# db table -> keys of results cached or read by this process in LRU order, used for MAX_ENTRIES_PER_PROCESS
+_cached_keys = {}
+
+
+def get_cache():
+    # results are read and written with the async cache API
+    if django.VERSION[:2] < (4, 0):
+        raise ImproperlyConfigured('The CACHE setting of DJANGO_TORTOISE requires Django 4.0 or later')
+    return caches[get_setting('CACHE_ALIAS')]
+
+
+def get_cache_options(tortoise_model):
+    cache_conf = get_setting('CACHE')
+    django_model = DJANGO_MODELS.get(tortoise_model)
+    if not cache_conf or django_model is None:
+        return None
+
+    cache_conf = {label.lower(): options for label, options in cache_conf.items()}
+    meta = django_model._meta
+    return cache_conf.get(meta.label_lower, cache_conf.get(meta.app_label))
+
+
+async def fetch_rows(tortoise_model, alias, sql, execute):
+    options = get_cache_options(tortoise_model)
+    if options is None:
+        return await execute()
+
+    cache = get_cache()
+
+    # every write bumps versions of its table, so results cached before are never read again
+    versions = await __aget_versions(cache, set(READ_TABLES.findall(sql)))
+    key = f'{KEY_PREFIX}:query:' + hashlib.sha1('\n'.join([alias, sql, *versions]).encode()).hexdigest()
+
+    rows = await cache.aget(key)
+    if rows is None:
+        rows = [dict(row) for row in await execute()]
+        await cache.aset(key, rows, options.get('TIMEOUT', DEFAULT_TIMEOUT))
+
+    evicted_keys = __remember_key(tortoise_model._meta.db_table, key, options.get('MAX_ENTRIES_PER_PROCESS'))
+    if evicted_keys:
+        await cache.adelete_many(evicted_keys)
+
+    return rows
+
+
+def __remember_key(table, key, max_entries):
+    keys = _cached_keys.setdefault(table, OrderedDict())
+    keys[key] = None
+    keys.move_to_end(key)
+
+    evicted_keys = []
+    while max_entries is not None and len(keys) > max_entries:
+        evicted_keys.append(keys.popitem(last=False)[0])
+
+    return evicted_keys
+
+
+def __get_version_key(table):
+    return f'{KEY_PREFIX}:version:{table}'
+
+
+async def __aget_versions(cache, tables):
+    version_keys = [__get_version_key(table) for table in sorted(tables)]
+    versions = await cache.aget_many(version_keys)
+
+    for version_key in version_keys:
+        if version_key not in versions:
+            # a lost version must not bring back results cached under the previous one
+            await cache.aadd(version_key, uuid.uuid4().hex, None)
+            versions[version_key] = await cache.aget(version_key, '')
+
+    return [versions[version_key] for version_key in version_keys]
+
+
+def invalidate_tables(tables, publish=True):
+    if get_setting('CACHE') and tables:
+        get_cache().set_many({__get_version_key(table): uuid.uuid4().hex for table in tables}, None)
+        if publish:
+            publish_invalidation(tables)
+
+
+async def ainvalidate_tables(tables, publish=True):
+    if get_setting('CACHE') and tables:
+        await get_cache().aset_many({__get_version_key(table): uuid.uuid4().hex for table in tables}, None)
+        if publish:
+            await apublish_invalidation(tables)
+
+
+def get_written_tables(sql):
+    return set(WRITE_TABLE.findall(sql))
+
+
+def __invalidate_on_commit(tables, using):
+    if not get_setting('CACHE'):
+        return
+
+    invalidate_tables(tables)
+
+    # the old rows can be cached again until the transaction is committed
+    if transaction.get_connection(using).in_atomic_block:
+        transaction.on_commit(lambda: invalidate_tables(tables), using=using)
+
+
+@receiver([post_save, post_delete])
+def __invalidate_model(sender, using, **kwargs):
+    __invalidate_on_commit({sender._meta.db_table}, using)
+
+
+@receiver(m2m_changed)
+def __invalidate_m2m(sender, instance, action, model, using, **kwargs):
+    if action.startswith('post_'):
+        __invalidate_on_commit({sender._meta.db_table, instance._meta.db_table, model._meta.db_table}, using)
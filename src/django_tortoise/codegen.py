@@ -0,0 +1,134 @@
+import hashlib
+import importlib.util
+import inspect
+import os
+import sys
+
+import django
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.serializer import serializer_factory
+
+from . import __version__
+from .models import get_tortoise_field_factories, get_tortoise_meta_attributes, TortoiseModel
+
+
+HEADER = '''\
+# Generated by django-tortoise {version}, do not edit.
+# Regenerate with: python manage.py generate_tortoise_models
+'''
+
+
+def get_fingerprint(apps):
+    # models and migrations sources define the generated models,
+    # file contents are hashed since paths differ between machines
+    fingerprint = hashlib.sha256(f'{django.__version__} {__version__}'.encode())
+
+    model_modules = sorted({django_model.__module__ for django_model in apps.get_models(include_auto_created=True)})
+    for module_name in model_modules:
+        source_file = inspect.getsourcefile(sys.modules[module_name])
+        fingerprint.update(module_name.encode())
+        with open(source_file, 'rb') as source:
+            fingerprint.update(source.read())
+
+    for app_config in apps.get_app_configs():
+        fingerprint.update(app_config.label.encode())
+        for migration_name, migration_file in __get_migration_files(app_config.label):
+            fingerprint.update(migration_name.encode())
+            with open(migration_file, 'rb') as migration:
+                fingerprint.update(migration.read())
+
+    return fingerprint.hexdigest()
+
+
+def __get_migration_files(app_label):
+    module_name, _ = MigrationLoader.migrations_module(app_label)
+    if module_name is None:
+        return []
+
+    try:
+        spec = importlib.util.find_spec(module_name)
+    except ImportError:
+        return []
+
+    if spec is None or not spec.submodule_search_locations:
+        return []
+
+    return sorted(
+        (file_name, os.path.join(location, file_name))
+        for location in spec.submodule_search_locations
+        for file_name in os.listdir(location)
+        if file_name.endswith('.py') and file_name != '__init__.py'
+    )
+
+
+def render_models_module(apps):
+    imports = set()
+    classes = []
+    labels = []
+
+    base_module = __import_module(TortoiseModel.__module__, imports)
+    for django_model in apps.get_models(include_auto_created=True):
+        class_name = f'{django_model.__name__}Tortoise'
+        lines = [f'class {class_name}({base_module}.{TortoiseModel.__qualname__}):']
+
+        for field_name, (field_factory, field_kwargs) in get_tortoise_field_factories(django_model).items():
+            factory_module = __import_module(field_factory.__module__, imports)
+            arguments = ', '.join(
+                f'{name}={__serialize(value, imports)}' for name, value in field_kwargs.items()
+            )
+            lines.append(f'    {field_name} = {factory_module}.{field_factory.__qualname__}({arguments})')
+
+        lines += ['', '    class Meta:']
+        for name, value in get_tortoise_meta_attributes(django_model).items():
+            if name == 'manager':
+                manager_module = __import_module(type(value).__module__, imports)
+                lines.append(f'        manager = {manager_module}.{type(value).__qualname__}()')
+            else:
+                lines.append(f'        {name} = {__serialize(value, imports)}')
+
+        classes.append('\n'.join(lines))
+        labels.append(f'    {django_model._meta.label!r}: {class_name},')
+
+    return '\n'.join([
+        HEADER.format(version=__version__),
+        *sorted(imports, key=lambda line: (line.startswith('from'), line)),
+        '',
+        '',
+        f'FINGERPRINT = {get_fingerprint(apps)!r}',
+        '',
+        '',
+        '\n\n\n'.join(classes),
+        '',
+        '',
+        'MODELS = {',
+        *labels,
+        '}',
+        '',
+    ])
+
+
+def __import_module(module_name, imports):
+    # aliased by the full path since tortoise and django-tortoise field modules share names
+    package_name, _, name = module_name.rpartition('.')
+    alias = module_name.replace('.', '_')
+    imports.add(f'from {package_name} import {name} as {alias}')
+    return alias
+
+
+def __serialize(value, imports):
+    # the same serialization Django uses to write migrations
+    string, value_imports = serializer_factory(value).serialize()
+    imports.update(value_imports)
+    return string
+
+
+def get_module_path(module_name):
+    package_name, _, name = module_name.rpartition('.')
+    if not package_name:
+        return os.path.abspath(f'{name}.py')
+
+    spec = importlib.util.find_spec(package_name)
+    if spec is None or not spec.submodule_search_locations:
+        raise ValueError(f'{package_name} is not a package')
+
+    return os.path.join(spec.submodule_search_locations[0], f'{name}.py')
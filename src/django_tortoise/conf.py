@@ -0,0 +1,39 @@
+from django.conf import settings
+
+
+DEFAULTS = {
+    # seconds a context keeps reading from the write database after a write
+    'READ_YOUR_WRITES': 0,
+    # app labels or <app_label>.<ModelName> to patch with abjects, None means all
+    'INCLUDE': None,
+    # app labels or <app_label>.<ModelName> not to patch with abjects
+    'EXCLUDE': (),
+    # dotted path of the module written by the generate_tortoise_models command
+    'MODELS_MODULE': None,
+    # seconds after which abjects queries are logged as warnings, None disables the slow query log
+    'SLOW_QUERY_THRESHOLD': None,
+    # dotted paths of callables receiving a QueryRecord after every abjects query
+    'QUERY_CALLBACKS': (),
+    # app labels or <app_label>.<ModelName> -> {'TIMEOUT': seconds, 'MAX_ENTRIES_PER_PROCESS': number}
+    # of cached abjects results
+    'CACHE': {},
+    # alias of the django cache used for abjects results
+    'CACHE_ALIAS': 'default',
+    # dotted path of the bus sharing cache invalidations between workers, None means the cache is shared
+    'INVALIDATION_BUS': None,
+    # PostgreSQL channel of the invalidation bus
+    'INVALIDATION_CHANNEL': 'django_tortoise_invalidation',
+    # seconds invalidations are collected for before they are sent or applied
+    'INVALIDATION_DELAY': 0.05,
+    # dotted paths of the dumps and loads functions of JSONField values without a custom encoder or decoder
+    'JSON_CODEC': ('json.dumps', 'json.loads'),
+    # JSONField values of abjects instances are kept as read from the database until their first access
+    'LAZY_JSON': False,
+    # app labels or <app_label>.<ModelName> -> django field types (e.g. 'TextField') abjects querysets do not select,
+    # the fields are fetched for the whole result set on their first access
+    'DEFER': {},
+}
+
+
+def get_setting(name):
+    return getattr(settings, 'DJANGO_TORTOISE', {}).get(name, DEFAULTS[name])
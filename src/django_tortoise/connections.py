@@ -0,0 +1,97 @@
+import asyncio
+
+from django.db import DEFAULT_DB_ALIAS
+from tortoise import Tortoise
+from tortoise.connection import connections
+
+from .bus import get_invalidation_bus
+from .models import __init
+
+
+_loop_connections = {}  # event loop -> task opening tortoise connections of the loop
+_loop_hooks = {}  # event loop -> async generator closing the connections of the loop
+
+
+async def open_connections():
+    loop = asyncio.get_running_loop()
+
+    try:
+        opening = _loop_connections[loop]
+    except KeyError:
+        __forget_closed_loops()
+        opening = _loop_connections[loop] = loop.create_task(__open_connections())
+
+        if loop not in _loop_hooks:
+            hook = _loop_hooks[loop] = __close_on_shutdown(loop)
+            await hook.__anext__()
+
+    if opening.done() and not opening.exception():
+        return opening.result()
+
+    try:
+        # concurrent first requests must not cancel the opening of each other
+        return await asyncio.shield(opening)
+    except Exception:
+        if _loop_connections.get(loop) is opening:
+            del _loop_connections[loop]
+        raise
+
+
+async def use_connections():
+    connections._set_storage(await open_connections())
+
+
+async def close_connections():
+    hook = _loop_hooks.get(asyncio.get_running_loop())
+    if hook is not None:
+        await hook.aclose()
+
+
+async def __close_on_shutdown(loop):
+    # asyncio.run() closes the async generators of a loop before closing the loop,
+    # so servers without the lifespan shutdown do not leave connections of dead loops behind
+    try:
+        yield
+    finally:
+        _loop_hooks.pop(loop, None)
+        await __close_connections(loop)
+
+
+def __forget_closed_loops():
+    # loops closed without shutting down their async generators, their connections cannot be closed anymore
+    for loop in [loop for loop in {*_loop_connections, *_loop_hooks} if loop.is_closed()]:
+        _loop_connections.pop(loop, None)
+        _loop_hooks.pop(loop, None)
+
+
+async def __close_connections(loop):
+    opening = _loop_connections.pop(loop, None)
+    if opening is None:
+        return
+
+    storage = await opening
+
+    bus = get_invalidation_bus()
+    if bus is not None and bus.loop is loop:
+        await bus.stop()
+
+    for client in storage.values():
+        await client.close()
+
+
+async def __open_connections():
+    if not Tortoise._inited:
+        await __init()
+
+    storage = {}
+    for alias in connections.db_config:
+        client = connections._create_connection(alias)
+        await client.create_connection(with_db=True)
+        storage[alias] = client
+
+    # a single subscription per process, on the loop opened first
+    bus = get_invalidation_bus()
+    if bus is not None and bus.loop is None:
+        await bus.start(storage[DEFAULT_DB_ALIAS])
+
+    return storage
@@ -0,0 +1,112 @@
+import operator
+
+from django.db import router
+from django.db.models import DEFERRED, signals
+from django.db.models.base import ModelState
+
+from .fields import LazyJSON
+from .models import DJANGO_MODELS, get_tortoise_model
+
+
+_copiers = {}  # django model -> _Copier of the fields shared with its tortoise model, in both directions
+
+
+class _Copier:
+    __slots__ = ('attnames', 'get_values')
+
+    def __init__(self, attnames):
+        self.attnames = attnames
+        self.get_values = operator.itemgetter(*attnames)
+        if len(attnames) == 1:
+            get_value = self.get_values
+            self.get_values = lambda instance_dict: (get_value(instance_dict),)
+
+    def __call__(self, instance_dict):
+        try:
+            return dict(zip(self.attnames, self.get_values(instance_dict))), False
+        except KeyError:
+            # deferred fields of django instances, .only() of tortoise ones
+            return {attname: instance_dict[attname] for attname in self.attnames if attname in instance_dict}, True
+
+
+def __get_copier(django_model, tortoise_model):
+    try:
+        return _copiers[django_model]
+    except KeyError:
+        pass
+
+    # foreign keys are copied as ids, fields without a tortoise counterpart stay deferred
+    fields_map = tortoise_model._meta.fields_map
+    attnames = [field.attname for field in django_model._meta.concrete_fields if field.name in fields_map]
+    return _copiers.setdefault(django_model, _Copier(attnames))
+
+
+def to_django(instances, using=None):
+    models = {}  # tortoise model -> (django model, copier, db, whether __init__ has to run, JSON field names)
+
+    django_instances = []
+    for instance in instances:
+        tortoise_model = type(instance)
+        try:
+            django_model, copy, db, slow, json_names = models[tortoise_model]
+        except KeyError:
+            django_model = DJANGO_MODELS[tortoise_model]
+            copy = __get_copier(django_model, tortoise_model)
+            db = using or router.db_for_read(django_model)
+            # e.g. ImageField dimensions and field trackers are set up in __init__
+            slow = signals.pre_init.has_listeners(django_model) or signals.post_init.has_listeners(django_model)
+            json_names = [
+                field.attname for field in django_model._meta.concrete_fields
+                if field.get_internal_type() == 'JSONField' and field.attname in copy.attnames
+            ]
+            models[tortoise_model] = django_model, copy, db, slow, json_names
+
+        values, _ = copy(instance.__dict__)
+        for name in json_names:
+            # values not accessed yet with LAZY_JSON
+            value = values.get(name)
+            if value.__class__ is LazyJSON:
+                values[name] = value.decode()
+        if slow:
+            attnames = [field.attname for field in django_model._meta.concrete_fields]
+            django_instance = django_model.from_db(db, attnames, [values.get(name, DEFERRED) for name in attnames])
+        else:
+            django_instance = django_model.__new__(django_model)
+            django_instance.__dict__.update(values)
+            django_instance._state = state = ModelState()
+            state.adding = False
+            state.db = db
+
+        django_instances.append(django_instance)
+
+    return django_instances
+
+
+def to_tortoise(instances):
+    models = {}  # django model -> (tortoise model, copier, whether the pk is generated by the database)
+
+    tortoise_instances = []
+    for instance in instances:
+        django_model = type(instance)
+        try:
+            tortoise_model, copy, custom_generated_pk = models[django_model]
+        except KeyError:
+            tortoise_model = get_tortoise_model(django_model)
+            copy = __get_copier(django_model, tortoise_model)
+            meta = tortoise_model._meta
+            custom_generated_pk = meta.db_pk_column not in meta.generated_db_fields
+            models[django_model] = tortoise_model, copy, custom_generated_pk
+
+        values, partial = copy(instance.__dict__)
+
+        # the same state as instances read by tortoise
+        tortoise_instance = tortoise_model.__new__(tortoise_model)
+        tortoise_instance_dict = tortoise_instance.__dict__
+        tortoise_instance_dict.update(values)
+        tortoise_instance_dict['_partial'] = partial
+        tortoise_instance_dict['_saved_in_db'] = not instance._state.adding
+        tortoise_instance_dict['_custom_generated_pk'] = custom_generated_pk
+
+        tortoise_instances.append(tortoise_instance)
+
+    return tortoise_instances
@@ -0,0 +1,125 @@
+import asyncio
+
+from tortoise.connection import connections
+from tortoise.exceptions import DoesNotExist, NoValuesFetched
+
+from .conf import get_setting
+
+
+BATCH = '_deferred_batch'  # the instance dict key of the DeferredBatch an instance was fetched in
+
+_deferred_fields = {}  # tortoise model -> names of the fields abjects querysets do not select
+
+
+def get_deferred_field_names(tortoise_model):
+    return _deferred_fields.get(tortoise_model, ())
+
+
+def compile_deferred_fields(tortoise_model, django_model):
+    meta = tortoise_model._meta
+    field_types = __get_deferred_types(django_model)
+    concrete_fields = django_model._meta.concrete_fields if field_types else ()
+    names = tuple(
+        field.name for field in concrete_fields
+        if field.get_internal_type() in field_types and field.name in meta.fields_db_projection
+        and not field.primary_key
+    )
+
+    for name in meta.fields_db_projection:
+        if name in names:
+            setattr(tortoise_model, name, DeferredAttribute(name))
+        elif isinstance(tortoise_model.__dict__.get(name), DeferredAttribute):
+            delattr(tortoise_model, name)
+
+    if names:
+        _deferred_fields[tortoise_model] = names
+    else:
+        _deferred_fields.pop(tortoise_model, None)
+
+
+def __get_deferred_types(django_model):
+    defer_conf = get_setting('DEFER')
+    if not defer_conf or django_model is None:
+        return ()
+
+    defer_conf = {label.lower(): field_types for label, field_types in defer_conf.items()}
+    meta = django_model._meta
+    return defer_conf.get(meta.label_lower, defer_conf.get(meta.app_label, ()))
+
+
+class DeferredBatch:
+    __slots__ = ('instances', 'connection_name')
+
+    def __init__(self, connection_name):
+        self.instances = []
+        self.connection_name = connection_name
+
+
+class DeferredAttribute:
+    # the first access of a deferred field fetches it for every instance of the same result set
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+
+        instance_dict = instance.__dict__
+        try:
+            return instance_dict[self.name]
+        except KeyError:
+            pass
+
+        batch = instance_dict.get(BATCH)
+        if batch is None:
+            raise AttributeError(self.name)
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            from .sync import run_sync
+            run_sync(fetch_deferred(batch.instances, self.name))
+        else:
+            # an event loop cannot wait for the query here
+            raise NoValuesFetched(f'{self.name} of {instance!r} is deferred, load it with fetch_deferred()')
+
+        try:
+            return instance_dict[self.name]
+        except KeyError:
+            raise DoesNotExist(f'{instance!r} does not exist anymore') from None
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.name] = value
+
+
+async def fetch_deferred(instances, *names):
+    instances = list(instances)
+    if not instances:
+        return
+
+    model = type(instances[0])
+    meta = model._meta
+    names = names or get_deferred_field_names(model)
+    missing = [instance for instance in instances if any(name not in instance.__dict__ for name in names)]
+    if not missing:
+        return
+
+    queryset = model.filter(pk__in=[instance.pk for instance in missing])
+    batch = missing[0].__dict__.get(BATCH)
+    if batch is not None and batch.connection_name is not None:
+        queryset = queryset.using_db(connections.get(batch.connection_name))
+
+    pk_attr = meta.pk_attr
+    found = {row.pop(pk_attr): row for row in await queryset.values(pk_attr, *names)}
+    for instance in missing:
+        values = found.get(instance.pk)
+        if values is None:
+            continue
+
+        # values assigned since the instance was fetched are kept
+        instance_dict = instance.__dict__
+        for name, value in values.items():
+            if name not in instance_dict:
+                instance_dict[name] = value
@@ -1,21 +1,72 @@
 import datetime
+import json
 import warnings
+from functools import partial
 
 import django
-from django.conf import settings
 from django.core.validators import validate_email, validate_slug, validate_unicode_slug, URLValidator
 from django.utils import timezone
 from django.utils.dateparse import parse_date, parse_datetime, parse_time, parse_duration
 from django.utils.duration import duration_microseconds, duration_string
 from django.utils.ipv6 import clean_ipv6_address
+from django.utils.module_loading import import_string
 from tortoise.fields.base import Field
 from tortoise.fields.data import (
     CharField,
     DateField as TortoiseDateField,
     DatetimeField as TortoiseDateTimeField,
+    JSONField as TortoiseJSONField,
 )
 from tortoise.validators import validate_ipv46_address, MinValueValidator, MaxValueValidator
 
+from .conf import get_setting
+
+
+def compile_model_converters(tortoise_model, db_backend, use_tz):
+    for field in tortoise_model._meta.fields_map.values():
+        # backend- and timezone-specific converters are resolved once, specialized functions
+        # are bound over to_python_value/to_db_value of the field instance
+        if hasattr(field, 'compile_converters'):
+            field.compile_converters(db_backend, use_tz)
+
+
+def compile_db_converter(field, value):
+    # the class-level convert_db_value of fields used before compile_model_converters()
+    from django.conf import settings
+    from .models import DB_BACKEND
+
+    field.compile_converters(DB_BACKEND, settings.USE_TZ)
+    return value if field.convert_db_value is None else field.convert_db_value(value)
+
+
+def get_returned_timezone():
+    # timezone of aware datetimes returned by the database
+    if django.VERSION[:2] >= (4, 1):
+        return timezone.get_default_timezone()
+    return timezone.utc
+
+
+def get_validate(field):
+    # validation is skipped as a whole for fields without validators
+    return field.validate if field.validators else None
+
+
+def get_to_python_values(to_python_value, generic_to_python_value, native_class, validate, convert=None):
+    # converts a whole column at once, values of the native class need no call at all
+    if validate is not None:
+        return lambda values: list(map(to_python_value, values))
+
+    if convert is not None:
+        return lambda values: [
+            convert(value) if value.__class__ is native_class else generic_to_python_value(value)
+            for value in values
+        ]
+
+    return lambda values: [
+        value if value.__class__ is native_class else generic_to_python_value(value)
+        for value in values
+    ]
+
 
 class BinaryField(Field, memoryview):
     indexable = False
@@ -26,6 +77,8 @@ class BinaryField(Field, memoryview):
 
 
 class DateField(TortoiseDateField):
+    use_tz = False
+
     def __init__(self, auto_now, auto_now_add, **kwargs):
         # Do not check combination of auto_now, auto_now_add, and default
         # since it has been done by Django
@@ -33,11 +86,28 @@ class DateField(TortoiseDateField):
         self.auto_now = auto_now
         self.auto_now_add = auto_now | auto_now_add
 
+    def compile_converters(self, db_backend, use_tz):
+        self.use_tz = use_tz
+
+        generic_to_python_value = type(self).to_python_value.__get__(self)
+        validate = get_validate(self)
+        date_class = datetime.date
+
+        def to_python_value(value):
+            if value.__class__ is date_class:
+                if validate is not None:
+                    validate(value)
+                return value
+            return generic_to_python_value(value)
+
+        self.to_python_value = to_python_value
+        self.to_python_values = get_to_python_values(to_python_value, generic_to_python_value, date_class, validate)
+
     def to_python_value(self, value):
         if value is None:
             return value
         if isinstance(value, datetime.datetime):
-            if settings.USE_TZ and timezone.is_aware(value):
+            if self.use_tz and timezone.is_aware(value):
                 default_timezone = timezone.get_default_timezone()
                 value = timezone.make_naive(value, default_timezone)
             value = value.date()
@@ -69,22 +139,51 @@ class DateField(TortoiseDateField):
 
 
 class DateTimeField(TortoiseDateTimeField):
+    db_backend = None
+    use_tz = False
+    returned_timezone = None
+
+    def compile_converters(self, db_backend, use_tz):
+        self.db_backend = db_backend
+        self.use_tz = use_tz
+        self.returned_timezone = returned_timezone = get_returned_timezone()
+
+        generic_to_python_value = type(self).to_python_value.__get__(self)
+        validate = get_validate(self)
+        datetime_class = datetime.datetime
+
+        if not use_tz:
+            def convert(value):
+                if value.tzinfo is not None and timezone.is_aware(value):
+                    value = timezone.make_naive(value)
+                return value
+        elif db_backend == 'postgresql':
+            def convert(value):
+                return value.astimezone(returned_timezone)
+        else:
+            convert = None
+
+        def to_python_value(value):
+            if value.__class__ is datetime_class:
+                if convert is not None:
+                    value = convert(value)
+                if validate is not None:
+                    validate(value)
+                return value
+            return generic_to_python_value(value)
+
+        self.to_python_value = to_python_value
+        self.to_python_values = get_to_python_values(
+            to_python_value, generic_to_python_value, datetime_class, validate, convert
+        )
+
     def to_python_value(self, value):
         if value is None:
             return value
         if isinstance(value, datetime.datetime):
-            if settings.USE_TZ:
-                from .models import DB_BACKEND
-                if DB_BACKEND == 'sqlite3':
-                    pass
-                elif DB_BACKEND == 'postgresql':
-
-                    if django.VERSION[:2] >= (4, 1):
-                        default_timezone = timezone.get_default_timezone()
-                    else:
-                        default_timezone = timezone.utc
-
-                    value = value.astimezone(default_timezone)
+            if self.use_tz:
+                if self.db_backend == 'postgresql':
+                    value = value.astimezone(self.returned_timezone)
             else:
                 if timezone.is_aware(value):
                     value = timezone.make_naive(value)
@@ -92,7 +191,7 @@ class DateTimeField(TortoiseDateTimeField):
             return value
         if isinstance(value, datetime.date):
             value = datetime.datetime(value.year, value.month, value.day)
-            if settings.USE_TZ:
+            if self.use_tz:
                 # For backwards compatibility, interpret naive datetimes in
                 # local time. This won't work during DST change, but we can't
                 # do much about it, so we let the exceptions percolate up the
@@ -112,12 +211,8 @@ class DateTimeField(TortoiseDateTimeField):
         try:
             parsed = parse_datetime(value)
             if parsed is not None:
-                if settings.USE_TZ and timezone.is_naive(parsed):
-                    if django.VERSION[:2] >= (4, 1):
-                        default_timezone = timezone.get_default_timezone()
-                    else:
-                        default_timezone = timezone.utc
-                    parsed = timezone.make_aware(parsed, default_timezone)
+                if self.use_tz and timezone.is_naive(parsed):
+                    parsed = timezone.make_aware(parsed, self.returned_timezone)
                 self.validate(parsed)
                 return parsed
         except ValueError as e:
@@ -144,7 +239,7 @@ class DateTimeField(TortoiseDateTimeField):
             setattr(instance, self.model_field_name, value)
 
         value = self.to_python_value(value)
-        if value is not None and settings.USE_TZ and timezone.is_naive(value):
+        if value is not None and self.use_tz and timezone.is_naive(value):
             warnings.warn(
                 "DateTimeField %s received a naive datetime (%s)"
                 " while time zone support is active." % (self.model_field_name, value),
@@ -159,6 +254,7 @@ class DateTimeField(TortoiseDateTimeField):
 
 class TimeField(Field, datetime.time):
     skip_to_python_if_native = True
+    convert_db_value = compile_db_converter
     SQL_TYPE = "TIME"
 
     class _db_oracle:
@@ -174,6 +270,28 @@ class TimeField(Field, datetime.time):
         self.auto_now = auto_now
         self.auto_now_add = auto_now | auto_now_add
 
+    def compile_converters(self, db_backend, use_tz):
+        generic_to_python_value = type(self).to_python_value.__get__(self)
+        validate = get_validate(self)
+        time_class = datetime.time
+
+        def to_python_value(value):
+            if value.__class__ is time_class:
+                if validate is not None:
+                    validate(value)
+                return value
+            return generic_to_python_value(value)
+
+        self.to_python_value = to_python_value
+        self.to_python_values = get_to_python_values(to_python_value, generic_to_python_value, time_class, validate)
+
+        if db_backend == 'postgresql':
+            self.convert_db_value = None
+        elif db_backend == 'sqlite3':
+            self.convert_db_value = time_class.isoformat
+        else:
+            raise NotImplementedError('Given database backend is not supported')
+
     def to_python_value(self, value):
         if value is None:
             return None
@@ -186,14 +304,14 @@ class TimeField(Field, datetime.time):
             # database backend (e.g. Oracle), so we'll be accommodating.
             value = value.time()
             self.validate(value)
-            return value.time()
+            return value
 
         try:
             parsed = parse_time(value)
             if parsed is not None:
                 self.validate(parsed)
                 return parsed
-        except ValueError:
+        except ValueError as e:
             raise ValueError(f'Bad value: {value}') from e
 
         raise ValueError(f'Bad value: {value}')
@@ -210,22 +328,28 @@ class TimeField(Field, datetime.time):
 
         self.validate(value)
 
-        from .models import DB_BACKEND
-        if DB_BACKEND == 'postgresql':
+        if value is None or self.convert_db_value is None:
             return value
-        elif DB_BACKEND == 'sqlite3':
-            return value.isoformat()
-
-        raise NotImplementedError('Given database backend is not supported')
+        return self.convert_db_value(value)
 
 
 class DurationField(Field, datetime.timedelta):
+    convert_db_value = compile_db_converter
+
     class _db_postgres:
         SQL_TYPE = 'INTERVAL'
 
     class _db_sqlite:
         SQL_TYPE = 'BIGINT'
 
+    def compile_converters(self, db_backend, use_tz):
+        if db_backend == 'postgresql':
+            self.convert_db_value = None
+        elif db_backend == 'sqlite3':
+            self.convert_db_value = duration_microseconds
+        else:
+            raise NotImplementedError('Given database backend is not supported')
+
     def to_python_value(self, value):
         if value is None or isinstance(value, datetime.timedelta):
             return value
@@ -243,16 +367,9 @@ class DurationField(Field, datetime.timedelta):
     def to_db_value(self, value, instance):
         self.validate(value)
 
-        if value is None:
-            return None
-
-        from .models import DB_BACKEND
-        if DB_BACKEND == 'postgresql':
+        if value is None or self.convert_db_value is None:
             return value
-        elif DB_BACKEND == 'sqlite3':
-            return duration_microseconds(value)
-
-        raise NotImplementedError('Given database backend is not supported')
+        return self.convert_db_value(value)
 
 
 class EmailField(CharField):
@@ -288,6 +405,7 @@ class GenericIPAddressField(Field):
     def to_db_value(self, value, instance):
         if value is None:
             return None
+        self.validate(value)
         if value and ":" in value:
             try:
                 return clean_ipv6_address(value, self.unpack_ipv4)
@@ -296,6 +414,88 @@ class GenericIPAddressField(Field):
         return str(value)
 
 
+class LazyJSON:
+    __slots__ = ('raw', 'loads')
+
+    def __init__(self, raw, loads):
+        self.raw = raw
+        self.loads = loads
+
+    def decode(self):
+        return self.loads(self.raw)
+
+    def __repr__(self):
+        return f'<LazyJSON {self.raw!r}>'
+
+
+class LazyJSONAttribute:
+    # the raw value read from the database is decoded on the first access and replaced by the result
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+
+        instance_dict = instance.__dict__
+        try:
+            value = instance_dict[self.name]
+        except KeyError:
+            raise AttributeError(self.name) from None
+
+        if value.__class__ is LazyJSON:
+            value = instance_dict[self.name] = value.decode()
+        return value
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.name] = value
+
+
+def get_text_dumps(dumps):
+    # e.g. orjson.dumps returns bytes
+    def text_dumps(value):
+        encoded = dumps(value)
+        return encoded.decode() if encoded.__class__ is bytes else encoded
+
+    return text_dumps
+
+
+class JSONField(TortoiseJSONField):
+    def __init__(self, encoder=None, decoder=None, **kwargs):
+        # json.JSONEncoder and json.JSONDecoder subclasses, as the options of django's JSONField
+        self.json_encoder = encoder
+        self.json_decoder = decoder
+        super().__init__(
+            encoder=partial(json.dumps, cls=encoder),
+            decoder=partial(json.loads, cls=decoder),
+            **kwargs,
+        )
+
+    def compile_converters(self, db_backend, use_tz):
+        dumps, loads = (import_string(path) for path in get_setting('JSON_CODEC'))
+        if self.json_encoder is not None:
+            dumps = partial(json.dumps, cls=self.json_encoder)
+        if self.json_decoder is not None:
+            loads = partial(json.loads, cls=self.json_decoder)
+
+        # the jsonb codec of asyncpg connections takes bytes and returns them
+        self.encoder = dumps if db_backend == 'postgresql' else get_text_dumps(dumps)
+        self.decoder = loads
+
+        model, name = self.model, self.model_field_name
+        if get_setting('LAZY_JSON'):
+            setattr(model, name, LazyJSONAttribute(name))
+            self.to_python_values = lambda values: [
+                None if value is None else LazyJSON(value, loads) for value in values
+            ]
+        else:
+            if isinstance(model.__dict__.get(name), LazyJSONAttribute):
+                delattr(model, name)
+            self.to_python_values = lambda values: [None if value is None else loads(value) for value in values]
+
+
 class SlugField(CharField, str):
     def __init__(self, allow_unicode=False, **kwargs):
         self.allow_unicode = allow_unicode
@@ -0,0 +1,127 @@
+import functools
+import logging
+import time
+from collections import deque
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.signals import request_started
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from .conf import get_setting
+
+
+logger = logging.getLogger('django_tortoise.queries')
+
+# the same shape as django.db.connection.queries, filled when DEBUG is on
+queries_log = deque(maxlen=9000)
+
+_query_callbacks = []
+_connection_wait = ContextVar('connection_wait', default=0.0)
+
+
+class QueryRecord:
+    __slots__ = ('alias', 'sql', 'params', 'started_at', 'duration', 'rowcount', 'connection_wait', 'exception')
+
+    def __init__(self, alias, sql, params, started_at, duration, rowcount, connection_wait, exception):
+        self.alias = alias
+        self.sql = sql
+        self.params = params
+        self.started_at = started_at  # time.time() of the query start, e.g. for tracing spans
+        self.duration = duration
+        self.rowcount = rowcount
+        self.connection_wait = connection_wait
+        self.exception = exception
+
+
+def add_query_callback(callback):
+    _query_callbacks.append(callback)
+
+
+def remove_query_callback(callback):
+    _query_callbacks.remove(callback)
+
+
+def get_query_callbacks():
+    return [*__import_callbacks(tuple(get_setting('QUERY_CALLBACKS'))), *_query_callbacks]
+
+
+@functools.lru_cache(maxsize=None)
+def __import_callbacks(paths):
+    return [import_string(path) for path in paths]
+
+
+@receiver(request_started)
+def reset_queries(**kwargs):
+    queries_log.clear()
+
+
+class TimedConnectionWrapper:
+    __slots__ = ('connection_wrapper',)
+
+    def __init__(self, connection_wrapper):
+        self.connection_wrapper = connection_wrapper
+
+    async def __aenter__(self):
+        started_at = time.perf_counter()
+        connection = await self.connection_wrapper.__aenter__()
+        _connection_wait.set(_connection_wait.get() + time.perf_counter() - started_at)
+        return connection
+
+    async def __aexit__(self, *exc_info):
+        return await self.connection_wrapper.__aexit__(*exc_info)
+
+
+async def instrument(alias, execute, sql, params, get_rowcount):
+    callbacks = get_query_callbacks()
+    slow_query_threshold = get_setting('SLOW_QUERY_THRESHOLD')
+    if not (callbacks or settings.DEBUG or slow_query_threshold is not None or logger.isEnabledFor(logging.DEBUG)):
+        return await execute()
+
+    token = _connection_wait.set(0.0)
+    started_at, perf_started_at = time.time(), time.perf_counter()
+    result = exception = None
+    try:
+        result = await execute()
+        return result
+    except Exception as e:
+        exception = e
+        raise
+    finally:
+        record = QueryRecord(
+            alias=alias,
+            sql=sql,
+            params=params,
+            started_at=started_at,
+            duration=time.perf_counter() - perf_started_at,
+            rowcount=None if exception else get_rowcount(result),
+            connection_wait=_connection_wait.get(),
+            exception=exception,
+        )
+        _connection_wait.reset(token)
+
+        __log_query(record, slow_query_threshold)
+        for callback in callbacks:
+            try:
+                callback(record)
+            except Exception:
+                # metrics exporters must never break queries
+                logger.exception('Query callback %r failed', callback)
+
+
+def __log_query(record, slow_query_threshold):
+    extra = {'duration': record.duration, 'sql': record.sql, 'params': record.params, 'alias': record.alias}
+
+    if settings.DEBUG:
+        queries_log.append({'sql': record.sql, 'time': '%.3f' % record.duration, 'alias': record.alias})
+
+    if slow_query_threshold is not None and record.duration >= slow_query_threshold:
+        logger.warning(
+            'Slow query (%.3f, waited %.3f for connection) %s; args=%s; alias=%s',
+            record.duration, record.connection_wait, record.sql, record.params, record.alias, extra=extra
+        )
+    else:
+        logger.debug(
+            '(%.3f) %s; args=%s; alias=%s', record.duration, record.sql, record.params, record.alias, extra=extra
+        )
@@ -0,0 +1,67 @@
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+_loader = ContextVar('django_tortoise_loader', default=None)
+
+
+def get_loader():
+    return _loader.get()
+
+
+@contextmanager
+def batched_loads():
+    token = _loader.set(Loader())
+    try:
+        yield
+    finally:
+        _loader.reset(token)
+
+
+class Loader:
+    def __init__(self):
+        self.batches = {}  # (model, field name, db) -> {key: future}, collected until the next loop iteration
+        self.tasks = set()
+
+    async def load(self, model, field_name, db, key):
+        # a cancelled caller must not cancel the other callers of the same key
+        return await asyncio.shield(self.__get_future(model, field_name, db, key))
+
+    def __get_future(self, model, field_name, db, key):
+        loop = asyncio.get_running_loop()
+        batch_key = (model, field_name, db)
+
+        batch = self.batches.get(batch_key)
+        if batch is None:
+            batch = self.batches[batch_key] = {}
+            loop.call_soon(self.__dispatch, batch_key)
+
+        future = batch.get(key)
+        if future is None:
+            future = batch[key] = loop.create_future()
+        return future
+
+    def __dispatch(self, batch_key):
+        task = asyncio.get_running_loop().create_task(self.__fetch(*batch_key, self.batches.pop(batch_key)))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    @staticmethod
+    async def __fetch(model, field_name, db, batch):
+        try:
+            instances = await model.filter(**{f'{field_name}__in': list(batch)}).using_db(db)
+        except asyncio.CancelledError:
+            for future in batch.values():
+                future.cancel()
+            raise
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        found = {getattr(instance, field_name): instance for instance in instances}
+        for key, future in batch.items():
+            if not future.done():
+                future.set_result(found.get(key))
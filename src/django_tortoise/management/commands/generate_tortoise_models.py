@@ -0,0 +1,51 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from ...codegen import get_module_path, render_models_module
+from ...conf import get_setting
+
+
+class Command(BaseCommand):
+    help = 'Writes generated Tortoise models to a python module, so they are not generated at runtime.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'module', nargs='?',
+            help='Dotted path of the module to write, the MODELS_MODULE setting by default.',
+        )
+        parser.add_argument(
+            '--output',
+            help='Path of the file to write, resolved from the module path by default.',
+        )
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Exit with a non-zero status if the module is missing or outdated instead of writing it.',
+        )
+
+    def handle(self, *args, module=None, output=None, check=False, **options):
+        module = module or get_setting('MODELS_MODULE')
+        if not (module or output):
+            raise CommandError('Pass a module path or set MODELS_MODULE in the DJANGO_TORTOISE setting')
+
+        try:
+            output = output or get_module_path(module)
+        except (ImportError, ValueError) as e:
+            raise CommandError(e) from e
+
+        source = render_models_module(apps)
+
+        if check:
+            try:
+                with open(output) as module_file:
+                    is_outdated = module_file.read() != source
+            except FileNotFoundError:
+                is_outdated = True
+
+            if is_outdated:
+                raise CommandError(f'{output} is outdated')
+            return
+
+        with open(output, 'w') as module_file:
+            module_file.write(source)
+
+        self.stdout.write(self.style.SUCCESS(f'Tortoise models written to {output}'))
@@ -9,6 +9,7 @@ from .fields import (
     DurationField,
     EmailField,
     GenericIPAddressField,
+    JSONField,
     SlugField,
     URLField,
     PositiveBigIntegerField,
@@ -39,69 +40,72 @@ def __get_base_field_kwargs(django_field):
         if base_kwargs['default'] is not models.NOT_PROVIDED
         else None)
 
+    # tortoise fields append own validators, django ones must stay untouched
+    base_kwargs['validators'] = list(base_kwargs['validators'])
+
     return base_kwargs
 
 
 def __get_auto_field(django_field):
     base_kwargs = __get_base_field_kwargs(django_field)
     base_kwargs.update({'pk': True})
-    return fields.IntField(**base_kwargs)
+    return fields.IntField, base_kwargs
 
 
 def __get_big_auto_field(django_field):
     base_kwargs = __get_base_field_kwargs(django_field)
     base_kwargs.update({'pk': True})
-    return fields.BigIntField(**base_kwargs)
+    return fields.BigIntField, base_kwargs
 
 
 def __get_big_integer_field(django_field):
     base_kwargs = __get_base_field_kwargs(django_field)
-    return fields.BigIntField(**base_kwargs)
+    return fields.BigIntField, base_kwargs
 
 
 def __get_binary_field(django_field):
     base_kwargs = __get_base_field_kwargs(django_field)
-    return BinaryField(**base_kwargs)
+    return BinaryField, base_kwargs
 
 
 def __get_boolean_field(django_field):
     base_kwargs = __get_base_field_kwargs(django_field)
-    return fields.BooleanField(**base_kwargs)
+    return fields.BooleanField, base_kwargs
 
 
 def __get_char_field(django_field):
     base_kwargs = __get_base_field_kwargs(django_field)
     max_length = django_field.max_length
-    return fields.CharField(**base_kwargs, max_length=max_length)
+    return fields.CharField, {**base_kwargs, 'max_length': max_length}
 
 
 def __get_date_field(django_field):
     base_kwargs = __get_base_field_kwargs(django_field)
     auto_now, auto_now_add = django_field.auto_now, django_field.auto_now_add
-    return DateField(**base_kwargs, auto_now=auto_now, auto_now_add=auto_now_add)
+    return DateField, {**base_kwargs, 'auto_now': auto_now, 'auto_now_add': auto_now_add}
 
 
 def __get_date_time_field(django_field):
     base_kwargs = __get_base_field_kwargs(django_field)
     auto_now, auto_now_add = django_field.auto_now, django_field.auto_now_add
-    return DateTimeField(**base_kwargs, auto_now=auto_now, auto_now_add=auto_now_add)
+    return DateTimeField, {**base_kwargs, 'auto_now': auto_now, 'auto_now_add': auto_now_add}
 
 
 def __get_decimal_field(django_field):
     base_kwargs = __get_base_field_kwargs(django_field)
     max_digits, decimal_places = django_field.max_digits, django_field.decimal_places
-    return fields.DecimalField(**base_kwargs, max_digits=max_digits, decimal_places=decimal_places)
+    return fields.DecimalField, {**base_kwargs, 'max_digits': max_digits, 'decimal_places': decimal_places}
 
 
 def __get_duration_field(django_field):
     base_kwargs = __get_base_field_kwargs(django_field)
-    return DurationField(**base_kwargs)
+    return DurationField, base_kwargs
 
 
 def __get_email_field(django_field):
     base_kwargs = __get_base_field_kwargs(django_field)
     max_length = django_field.max_length
-    return EmailField(**base_kwargs,  max_length=max_length)
+    return EmailField, {**base_kwargs, 'max_length': max_length}
 
 
 def __get_file_field(django_field):
@@ -114,13 +118,13 @@ def __get_file_path_field(django_field):
 
 def __get_float_field(django_field):
     base_kwargs = __get_base_field_kwargs(django_field)
-    return fields.FloatField(**base_kwargs)
+    return fields.FloatField, base_kwargs
 
 
 def __get_generic_ip_address_field(django_field):
     base_kwargs = __get_base_field_kwargs(django_field)
     protocol, unpack_ipv4 = django_field.protocol, django_field.unpack_ipv4
-    return GenericIPAddressField(**base_kwargs, protocol=protocol, unpack_ipv4=unpack_ipv4)
+    return GenericIPAddressField, {**base_kwargs, 'protocol': protocol, 'unpack_ipv4': unpack_ipv4}
 
 
 def __get_image_field(django_field):
@@ -129,7 +133,7 @@ def __get_image_field(django_field):
 
 def __get_integer_field(django_field):
     base_kwargs = __get_base_field_kwargs(django_field)
-    return fields.IntField(**base_kwargs)
+    return fields.IntField, base_kwargs
 
 
 def __get_json_field(django_field):
@@ -139,62 +143,71 @@ def __get_json_field(django_field):
         base_kwargs['encoder'] = encoder
     if decoder:
         base_kwargs['decoder'] = decoder
-    return fields.JSONField(**base_kwargs)
+    return JSONField, base_kwargs
 
 
 def __get_positive_big_integer_field(django_field):
     base_kwargs = __get_base_field_kwargs(django_field)
-    return PositiveBigIntegerField(**base_kwargs)
+    return PositiveBigIntegerField, base_kwargs
 
 
 def __get_positive_integer_field(django_field):
     base_kwargs = __get_base_field_kwargs(django_field)
-    return PositiveIntegerField(**base_kwargs)
+    return PositiveIntegerField, base_kwargs
 
 
 def __get_positive_small_integer_field(django_field):
     base_kwargs = __get_base_field_kwargs(django_field)
-    return PositiveSmallIntegerField(**base_kwargs)
+    return PositiveSmallIntegerField, base_kwargs
 
 
 def __get_slug_field(django_field):
     base_kwargs = __get_base_field_kwargs(django_field)
     max_length = django_field.max_length
     allow_unicode = django_field.allow_unicode
-    return SlugField(**base_kwargs, max_length=max_length, allow_unicode=allow_unicode)
+    return SlugField, {**base_kwargs, 'max_length': max_length, 'allow_unicode': allow_unicode}
 
 
 def __get_small_auto_field(django_field):
     base_kwargs = __get_base_field_kwargs(django_field)
     base_kwargs.update({'pk': True})
-    return fields.SmallIntField(**base_kwargs)
+    return fields.SmallIntField, base_kwargs
 
 
 def __get_small_integer_field(django_field):
     base_kwargs = __get_base_field_kwargs(django_field)
-    return fields.SmallIntField(**base_kwargs)
+    return fields.SmallIntField, base_kwargs
 
 
 def __get_text_field(django_field):
     base_kwargs = __get_base_field_kwargs(django_field)
-    return fields.TextField(**base_kwargs)
+    return fields.TextField, base_kwargs
 
 
 def __get_time_field(django_field):
     base_kwargs = __get_base_field_kwargs(django_field)
     auto_now, auto_now_add = django_field.auto_now, django_field.auto_now_add
-    return TimeField(**base_kwargs, auto_now=auto_now, auto_now_add=auto_now_add)
+    return TimeField, {**base_kwargs, 'auto_now': auto_now, 'auto_now_add': auto_now_add}
 
 
 def __get_url_field(django_field):
     base_kwargs = __get_base_field_kwargs(django_field)
     max_length = django_field.max_length
-    return URLField(**base_kwargs, max_length=max_length)
+    return URLField, {**base_kwargs, 'max_length': max_length}
 
 
 def __get_uuid_field(django_field):
     base_kwargs = __get_base_field_kwargs(django_field)
-    return fields.UUIDField(**base_kwargs)
+    return fields.UUIDField, base_kwargs
+
+
+def __get_related_name(django_field):
+    remote_field = django_field.remote_field
+
+    # the same reverse accessors as django, which adds none for related_name ending with '+'
+    if remote_field.is_hidden():
+        return False
+    return remote_field.get_accessor_name()
 
 
 ON_DELETE = {
@@ -213,11 +226,16 @@ def __get_foreign_key_field(django_field):
         to = to.__name__
 
     model_name = f'django_tortoise.{to}Tortoise'
-    related_name = django_field.remote_field.related_name
+    related_name = __get_related_name(django_field)
     on_delete = ON_DELETE[django_field.remote_field.on_delete]
     null = on_delete is fields.SET_NULL
 
-    return fields.ForeignKeyField(model_name=model_name, related_name=related_name, on_delete=on_delete, null=null)
+    return fields.ForeignKeyField, {
+        'model_name': model_name,
+        'related_name': related_name,
+        'on_delete': on_delete,
+        'null': null,
+    }
 
 
 def __get_one_to_one_field(django_field):
@@ -229,11 +247,16 @@ def __get_one_to_one_field(django_field):
         to = to.__name__
 
     model_name = f'django_tortoise.{to}Tortoise'
-    related_name = django_field.remote_field.related_name
+    related_name = __get_related_name(django_field)
     on_delete = ON_DELETE[django_field.remote_field.on_delete]
     null = on_delete is fields.SET_NULL
 
-    return fields.OneToOneField(model_name=model_name, related_name=related_name, on_delete=on_delete, null=null)
+    return fields.OneToOneField, {
+        'model_name': model_name,
+        'related_name': related_name,
+        'on_delete': on_delete,
+        'null': null,
+    }
 
 
 def __get_many_to_many_field(django_field):
@@ -245,7 +268,7 @@ def __get_many_to_many_field(django_field):
         forward = forward.__name__
 
     model_name = f'django_tortoise.{forward}Tortoise'
-    related_name = django_field.remote_field.related_name
+    related_name = __get_related_name(django_field)
 
     through = django_field.remote_field.through._meta.db_table
 
@@ -255,19 +278,17 @@ def __get_many_to_many_field(django_field):
     else:
         backward_key, forward_key = f'{django_field.model._meta.object_name.lower()}_id', f'{forward.lower()}_id'
 
-    return fields.ManyToManyField(
-        model_name=model_name,
-        related_name=related_name,
-        through=through,
-        forward_key=forward_key,
-        backward_key=backward_key,
-    )
-
-
-# # reverse relationship fields
-# def __get_many_to_one_rel(django_field):
+    return fields.ManyToManyField, {
+        'model_name': model_name,
+        'related_name': related_name,
+        'through': through,
+        'forward_key': forward_key,
+        'backward_key': backward_key,
+    }
 
 
+# every mapper returns a field factory and its kwargs, so a field can be
+# either built at runtime or rendered into python code
 DJANGO_TORTOISE_FIELD_MAPPING = {
     # data fields
     models.AutoField: __get_auto_field,
@@ -304,6 +325,6 @@ DJANGO_TORTOISE_FIELD_MAPPING = {
     models.OneToOneField: __get_one_to_one_field,
     models.ManyToManyField: __get_many_to_many_field,
 
-    # reverse relationship fields
-    # models.ManyToOneRel: __get_many_to_one_rel,
+    # reverse relationship fields (ManyToOneRel, OneToOneRel, ManyToManyRel) are not mapped,
+    # tortoise adds them from the forward fields of related models
 }
@@ -1,14 +1,31 @@
 import asyncio
-import signal
-import sys
+import importlib
+import logging
+import threading
+import time
 
+from django.apps import apps as global_apps
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import ForeignObjectRel, QuerySet as DjangoQuerySet
+from django.dispatch import receiver
 from tortoise import models, Tortoise
 
+from .conf import get_setting
+from .deferred import compile_deferred_fields, get_deferred_field_names
+from .fields import compile_model_converters
 from .mapping import DJANGO_TORTOISE_FIELD_MAPPING
+from .queryset import Manager
+from .translation import as_abjects
 
 
+logger = logging.getLogger('django_tortoise')
+
 SYMBIOTIC_MODELS = {}
+DJANGO_MODELS = {}  # tortoise model -> django model
+TORTOISE_MODELS = {}  # django model -> tortoise model
+REVERSE_RELATIONS = {}  # tortoise model -> reverse accessor name -> django model pointing to it, not generated yet
 __models__ = list()
 DB_BACKEND = None
 
@@ -21,14 +38,280 @@ class _SymbioticModel:
         self.tortoise_model = tortoise_model
 
 
+class _LazyTortoiseModel:
+    __slots__ = ('django_model',)
+
+    def __init__(self, django_model):
+        self.django_model = django_model
+
+    def __get__(self, instance, owner):
+        return get_tortoise_model(self.django_model)
+
+
+class _LazyReverseRelation:
+    # the patched model pointing to this one is generated on the first access of its reverse accessor
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
+        generate_reverse_relations(owner, (self.name,))
+        if owner.__dict__.get(self.name) is self:
+            raise AttributeError(self.name)
+        return getattr(instance, self.name)
+
+
+class TortoiseModel(models.Model):
+    def get_deferred_fields(self):
+        instance_dict = self.__dict__
+        return {name for name in get_deferred_field_names(type(self)) if name not in instance_dict}
+
+    async def save(self, using_db=None, update_fields=None, force_create=False, force_update=False):
+        # as in django, only the loaded fields of instances with deferred fields are updated
+        if update_fields is None and self._saved_in_db and not force_create:
+            deferred = self.get_deferred_fields()
+            if deferred:
+                update_fields = [name for name in self._meta.fields_db_projection if name not in deferred]
+
+        await super().save(using_db, update_fields, force_create, force_update)
+
+    @classmethod
+    async def bulk_copy(cls, objects, chunk_size=10000, using_db=None):
+        db = using_db or cls._choose_db(True)
+        executor = db.executor_class(model=cls, db=db)
+
+        count = 0
+        async for chunk in _iterate_chunks(objects, chunk_size):
+            await executor.execute_copy([cls(**obj) if isinstance(obj, dict) else obj for obj in chunk])
+            count += len(chunk)
+
+        return count
+
+    @classmethod
+    async def bulk_upsert(cls, objects, conflict_field=None, update_fields=None, chunk_size=10000, using_db=None):
+        conflict_field = conflict_field or _get_conflict_field(cls)
+        field = cls._meta.fields_map.get(conflict_field)
+        if field is None or not (field.pk or field.unique):
+            raise ValueError(f'{conflict_field} is neither a primary key nor a unique field of {cls.__name__}')
+
+        db = using_db or cls._choose_db(True)
+
+        inserted, updated = 0, 0
+        async for chunk in _iterate_chunks(objects, chunk_size):
+            # the staging table lives on the connection of the transaction
+            async with db._in_transaction() as connection:
+                executor = connection.executor_class(model=cls, db=connection)
+                chunk_inserted, chunk_updated = await executor.execute_upsert(
+                    [cls(**obj) if isinstance(obj, dict) else obj for obj in chunk], conflict_field, update_fields
+                )
+            inserted += chunk_inserted
+            updated += chunk_updated
+
+        return inserted, updated
+
+    class Meta:
+        abstract = True
+
+
+def _get_conflict_field(tortoise_model):
+    meta = tortoise_model._meta
+    unique_fields = [
+        name for name, field in meta.fields_map.items()
+        if field.unique and not field.pk and name in meta.fields_db_projection
+    ]
+
+    if len(unique_fields) > 1:
+        raise ValueError(f'{tortoise_model.__name__} has several unique fields, conflict_field must be given')
+
+    return unique_fields[0] if unique_fields else meta.pk_attr
+
+
+async def _iterate_chunks(objects, chunk_size):
+    chunk = []
+
+    if hasattr(objects, '__aiter__'):
+        async for obj in objects:
+            chunk.append(obj)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+    else:
+        for obj in objects:
+            chunk.append(obj)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+
+    if chunk:
+        yield chunk
+
+
+_generation_lock = threading.RLock()
+
+
 def tortoise_setup(apps):
-    for app_models in apps.all_models.values():
+    started_at = time.perf_counter()
+
+    patched, total = 0, 0
+    for app_label, app_models in apps.all_models.items():
         for model_name, django_model in app_models.items():
-            tortoise_model = generate_tortoise_model(django_model)
-            __models__.append(tortoise_model)
-            setattr(django_model, 'abjects', tortoise_model)  # the main magic
+            total += 1
+            if not __is_patched(app_label, model_name):
+                continue
+
+            setattr(django_model, 'abjects', _LazyTortoiseModel(django_model))  # the main magic
+            patched += 1
 
-            SYMBIOTIC_MODELS[model_name] = _SymbioticModel(django_model, tortoise_model)
+    # Model.objects.filter(...).as_abjects() runs the same query through Tortoise
+    setattr(DjangoQuerySet, 'as_abjects', as_abjects)
+
+    logger.info(
+        'Patched %d of %d models in %.2f ms, Tortoise models are generated on first access',
+        patched, total, (time.perf_counter() - started_at) * 1000
+    )
+
+
+def __is_patched(app_label, model_name):
+    labels = {app_label.lower(), f'{app_label}.{model_name}'.lower()}
+
+    include, exclude = get_setting('INCLUDE'), get_setting('EXCLUDE')
+    if include is not None and not labels & {label.lower() for label in include}:
+        return False
+
+    return not labels & {label.lower() for label in exclude}
+
+
+def get_tortoise_model(django_model):
+    try:
+        return TORTOISE_MODELS[django_model]
+    except KeyError:
+        pass
+
+    with _generation_lock:
+        if django_model not in TORTOISE_MODELS:
+            started_at = time.perf_counter()
+
+            tortoise_models = []
+            __generate_tortoise_models(django_model, tortoise_models)
+            if Tortoise._inited:
+                __register_tortoise_models(tortoise_models)
+
+            logger.debug(
+                'Generated %d Tortoise models for %s in %.2f ms',
+                len(tortoise_models), django_model._meta.label, (time.perf_counter() - started_at) * 1000
+            )
+
+    return TORTOISE_MODELS[django_model]
+
+
+def __generate_tortoise_models(django_model, tortoise_models):
+    if django_model in TORTOISE_MODELS:
+        return
+
+    tortoise_model = (
+        __get_static_tortoise_models().get(django_model._meta.label)
+        or generate_tortoise_model(django_model)
+    )
+    __models__.append(tortoise_model)
+    tortoise_models.append(tortoise_model)
+
+    SYMBIOTIC_MODELS[django_model._meta.model_name] = _SymbioticModel(django_model, tortoise_model)
+    DJANGO_MODELS[tortoise_model] = django_model
+    TORTOISE_MODELS[django_model] = tortoise_model
+
+    # the descriptor is not needed anymore
+    if isinstance(django_model.__dict__.get('abjects'), _LazyTortoiseModel):
+        setattr(django_model, 'abjects', tortoise_model)
+
+    # tortoise relations can be resolved only when related models are generated too
+    reverse_relations = {}
+    for django_field in django_model._meta.get_fields(include_hidden=False):
+        if not django_field.is_relation or not django_field.related_model:
+            continue
+
+        if not isinstance(django_field, ForeignObjectRel):
+            __generate_tortoise_models(django_field.related_model, tortoise_models)
+            continue
+
+        # reverse accessors are added by the models pointing to this one, which are generated on first use
+        related_model = django_field.related_model
+        related_meta = related_model._meta
+        if related_model not in TORTOISE_MODELS and __is_patched(related_meta.app_label, related_meta.model_name):
+            name = django_field.get_accessor_name()
+            reverse_relations[name] = related_model
+            setattr(tortoise_model, name, _LazyReverseRelation(name))
+
+    if reverse_relations:
+        REVERSE_RELATIONS[tortoise_model] = reverse_relations
+
+
+def generate_reverse_relations(tortoise_model, names=None):
+    reverse_relations = REVERSE_RELATIONS.get(tortoise_model)
+    if not reverse_relations:
+        return
+
+    with _generation_lock:
+        for name in list(reverse_relations) if names is None else names:
+            django_model = reverse_relations.pop(name, None)
+            if django_model is not None:
+                get_tortoise_model(django_model)
+
+
+_static_tortoise_models = None
+
+
+def __get_static_tortoise_models():
+    global _static_tortoise_models
+
+    if _static_tortoise_models is None:
+        _static_tortoise_models = {}
+
+        module_name = get_setting('MODELS_MODULE')
+        if module_name:
+            from .codegen import get_fingerprint
+
+            try:
+                module = importlib.import_module(module_name)
+            except ImportError:
+                logger.warning(
+                    '%s cannot be imported, run "manage.py generate_tortoise_models" to create it', module_name
+                )
+            else:
+                if module.FINGERPRINT == get_fingerprint(global_apps):
+                    _static_tortoise_models = module.MODELS
+                else:
+                    logger.warning(
+                        '%s is outdated, run "manage.py generate_tortoise_models" to update it', module_name
+                    )
+
+    return _static_tortoise_models
+
+
+def __register_tortoise_models(tortoise_models):
+    app_models = Tortoise.apps['django_tortoise']
+    for tortoise_model in tortoise_models:
+        tortoise_model._meta.app = 'django_tortoise'
+        tortoise_model._meta.default_connection = DEFAULT_DB_ALIAS
+        app_models[tortoise_model.__name__] = tortoise_model
+
+    Tortoise._init_relations()
+    Tortoise._build_initial_querysets()
+
+    for tortoise_model in tortoise_models:
+        compile_model_converters(tortoise_model, DB_BACKEND, settings.USE_TZ)
+        compile_deferred_fields(tortoise_model, DJANGO_MODELS.get(tortoise_model))
+
+
+@receiver(setting_changed)
+def __recompile_converters(setting, **kwargs):
+    if setting in ('USE_TZ', 'TIME_ZONE', 'DJANGO_TORTOISE') and Tortoise._inited:
+        for tortoise_model in Tortoise.apps['django_tortoise'].values():
+            compile_model_converters(tortoise_model, DB_BACKEND, settings.USE_TZ)
+            compile_deferred_fields(tortoise_model, DJANGO_MODELS.get(tortoise_model))
 
 
 def generate_tortoise_model(django_model):
@@ -41,7 +324,7 @@ def generate_tortoise_model(django_model):
     tortoise_model = type(
         tortoise_model_name,
         (
-            models.Model,
+            TortoiseModel,
         ),
         {
             'Meta': tortoise_meta_class,
@@ -53,113 +336,188 @@ def generate_tortoise_model(django_model):
 
 
 def get_tortoise_fields(django_model):
+    return {
+        field_name: field_factory(**field_kwargs)
+        for field_name, (field_factory, field_kwargs) in get_tortoise_field_factories(django_model).items()
+    }
+
 
-    tortoise_fields = {}
+def get_tortoise_field_factories(django_model):
+
+    field_factories = {}
     for django_field in django_model._meta.get_fields(include_hidden=False):
         field_type = type(django_field)
         try:
-            tortoise_field = DJANGO_TORTOISE_FIELD_MAPPING[field_type](django_field)
+            field_factory = DJANGO_TORTOISE_FIELD_MAPPING[field_type](django_field)
         except KeyError:
             # skip reverse related fields
             continue
 
-        tortoise_fields[django_field.name] = tortoise_field
+        field_factories[django_field.name] = field_factory
 
-    return tortoise_fields
+    return field_factories
 
 
 def get_tortoise_meta_class(django_model):
-    meta = django_model._meta
-
-    attribute_dict = {
-        'abstract': meta.abstract,
-        'table': meta.db_table,
-        'schema': meta.db_tablespace,
-        'ordering': meta.ordering
-    }
-
     class_tortoise_meta = type(
         'Meta',
         tuple(),
-        attribute_dict
+        get_tortoise_meta_attributes(django_model)
     )
 
     return class_tortoise_meta
 
 
-def tortoise_init():
-    run_async(__init())
-    register_tortoise_shutdown()
+def get_tortoise_meta_attributes(django_model):
+    meta = django_model._meta
+
+    return {
+        'abstract': meta.abstract,
+        'table': meta.db_table,
+        'schema': meta.db_tablespace,
+        'ordering': meta.ordering,
+        'manager': Manager(),
+    }
 
 
 async def __init():
-    db_conf = __get_db_conf()
+    connections_conf = {alias: __get_db_conf(alias) for alias in __get_db_aliases()}
+
+    # a single database needs no routing at all
+    routers = ['django_tortoise.routers.DjangoRouter'] if len(connections_conf) > 1 else []
 
-    # support default db only
     await Tortoise.init(
         config={
-            'connections': {
-                'default': db_conf
-            },
+            'connections': connections_conf,
             'apps': {
                 'django_tortoise': {
-                    'models': ['django_tortoise.models'],
-                    'default_connection': 'default'
+                    # models are registered on demand
+                    'models': [],
+                    'default_connection': DEFAULT_DB_ALIAS
                 }
-            }
+            },
+            'routers': routers
         },
         use_tz=settings.USE_TZ,
         timezone=settings.TIME_ZONE
     )
 
+    with _generation_lock:
+        if __models__:
+            __register_tortoise_models(__models__)
+
+
+def __get_db_aliases():
+    # the default database goes first since it defines DB_BACKEND
+    return [DEFAULT_DB_ALIAS, *(alias for alias in settings.DATABASES if alias != DEFAULT_DB_ALIAS)]
 
-def __get_db_conf():
+
+def __get_db_conf(alias=DEFAULT_DB_ALIAS):
     global DB_BACKEND
 
-    # support default db only
-    django_db_conf = settings.DATABASES['default']
+    django_db_conf = settings.DATABASES[alias]
     engine = django_db_conf['ENGINE']
 
     if engine == 'django.db.backends.postgresql':
         tortoise_db_conf = {
-            'engine': 'tortoise.backends.asyncpg',
-            'credentials': {
-                'host': django_db_conf['HOST'],
-                'port': django_db_conf['PORT'],
-                'user': django_db_conf['USER'],
-                'password': django_db_conf['PASSWORD'],
-                'database': django_db_conf['NAME'],
-            }
+            'engine': 'django_tortoise.backends.asyncpg',
+            'credentials': __get_postgresql_credentials(django_db_conf)
         }
 
-        DB_BACKEND = 'postgresql'
+        db_backend = 'postgresql'
 
     elif engine == 'django.db.backends.sqlite3':
         tortoise_db_conf = {
-            "engine": "tortoise.backends.sqlite",
-            "credentials": {"file_path": django_db_conf['NAME']},
+            'engine': 'django_tortoise.backends.sqlite',
+            'credentials': __get_sqlite_credentials(django_db_conf),
         }
 
-        DB_BACKEND = 'sqlite3'
+        db_backend = 'sqlite3'
 
     else:
         raise NotImplementedError('Given database backend is not supported')
 
+    # fields convert values for a single backend only
+    if alias == DEFAULT_DB_ALIAS:
+        DB_BACKEND = db_backend
+    elif db_backend != DB_BACKEND:
+        raise NotImplementedError('Databases with different backends are not supported')
+
     return tortoise_db_conf
 
 
-def register_tortoise_shutdown():
-    for signame in [x for x in dir(signal) if x.startswith("SIG")]:
-        try:
-            signum = getattr(signal, signame)
-            signal.signal(signum, __shutdown_handler)
-        except (OSError, RuntimeError, ValueError):
-            pass
+# DATABASES[<alias>]['POOL'] option -> asyncpg pool option
+POOL_KWARGS = {
+    'MIN_SIZE': 'minsize',
+    'MAX_SIZE': 'maxsize',
+    'MAX_QUERIES': 'max_queries',
+    'STATEMENT_CACHE_SIZE': 'statement_cache_size',
+}
+
+# DATABASES[<alias>]['OPTIONS'] option -> asyncpg connection option
+POSTGRESQL_OPTIONS = {
+    'sslmode': 'ssl',
+    'application_name': 'application_name',
+    'connect_timeout': 'timeout',
+}
+
+
+def __get_postgresql_credentials(django_db_conf):
+    credentials = {
+        'host': django_db_conf['HOST'],
+        'port': django_db_conf['PORT'],
+        'user': django_db_conf['USER'],
+        'password': django_db_conf['PASSWORD'],
+        'database': django_db_conf['NAME'],
+    }
+
+    pool_conf = django_db_conf.get('POOL') or {}
+    for django_option, asyncpg_option in POOL_KWARGS.items():
+        if django_option in pool_conf:
+            credentials[asyncpg_option] = pool_conf[django_option]
+
+    # CONN_MAX_AGE=None means unlimited persistent connections in Django,
+    # 0 (the Django default) keeps the asyncpg default lifetime since closing
+    # pooled connections after each use would cause connection storms
+    conn_max_age = django_db_conf.get('CONN_MAX_AGE', 0)
+    if conn_max_age is None:
+        credentials['max_inactive_connection_lifetime'] = 0
+    elif conn_max_age > 0:
+        credentials['max_inactive_connection_lifetime'] = conn_max_age
+
+    if django_db_conf.get('CONN_HEALTH_CHECKS'):
+        credentials['setup'] = __check_connection_health
+
+    options = django_db_conf.get('OPTIONS') or {}
+    for django_option, asyncpg_option in POSTGRESQL_OPTIONS.items():
+        if django_option in options:
+            credentials[asyncpg_option] = options[django_option]
+
+    return credentials
+
 
+async def __check_connection_health(connection):
+    # asyncpg closes the connection if the pool setup callback fails,
+    # so a broken connection is never handed out twice
+    await connection.fetchval('SELECT 1')
 
-def __shutdown_handler(signum, _):
-    run_async(Tortoise.close_connections())
-    sys.exit(signum)
+
+def __get_sqlite_credentials(django_db_conf):
+    credentials = {'file_path': django_db_conf['NAME']}
+
+    # django passes OPTIONS to sqlite3.connect(), so only its timeout (in seconds) is taken from there
+    options = django_db_conf.get('OPTIONS') or {}
+    if 'timeout' in options:
+        credentials['busy_timeout'] = int(options['timeout'] * 1000)
+
+    # ignored by Django, e.g. {'synchronous': 'NORMAL', 'mmap_size': 268435456, 'cache_size': -64000}
+    credentials.update(django_db_conf.get('PRAGMAS') or {})
+
+    pool_conf = django_db_conf.get('POOL') or {}
+    if 'MAX_SIZE' in pool_conf:
+        credentials['read_pool_size'] = pool_conf['MAX_SIZE']
+
+    return credentials
 
 
 def run_async(coro):
@@ -169,6 +527,8 @@ def run_async(coro):
         loop = None
 
     if loop and loop.is_running():
-        loop.create_task(coro)
-    else:
-        asyncio.run(coro)
+        return loop.create_task(coro)
+
+    # sync code reuses the pools of a single background loop
+    from .sync import run_sync
+    return run_sync(coro)
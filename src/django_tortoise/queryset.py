@@ -0,0 +1,180 @@
+from pypika import Order
+from tortoise import manager, queryset
+from tortoise.exceptions import DoesNotExist, ParamsError
+from tortoise.query_utils import Prefetch
+
+from .deferred import get_deferred_field_names
+from .loaders import get_loader
+
+
+STREAM_PK = '_stream_pk'  # the key of windows selected by values()
+
+
+class QuerySet(queryset.QuerySet):
+    _limited = False  # offset() alone sets the _limit of backends requiring one
+
+    def _clone(self):
+        queryset = super()._clone()
+        queryset._limited = self._limited
+        return queryset
+
+    def limit(self, limit):
+        queryset = super().limit(limit)
+        queryset._limited = True
+        return queryset
+
+    def __await__(self):
+        loader = get_loader()
+        field_name = loader and self.__get_loader_field()
+        if not field_name:
+            return super().__await__()
+
+        (value,) = self._q_objects[0].filters.values()
+        try:
+            key = self.model._meta.fields_map[field_name].to_python_value(value)
+        except (TypeError, ValueError):
+            return super().__await__()
+
+        if self._db is None:
+            self._db = self._choose_db()
+        return self.__load(loader, field_name, key).__await__()
+
+    def _make_query(self):
+        deferred = not (self._fields_for_select or self._annotations or self._select_related) and (
+            get_deferred_field_names(self.model)
+        )
+        if not deferred:
+            return super()._make_query()
+
+        # the same query as only() of the other fields, hydrate() lets the instances fetch the rest on access
+        self._fields_for_select = tuple(name for name in self.model._meta.fields_db_projection if name not in deferred)
+        try:
+            super()._make_query()
+        finally:
+            self._fields_for_select = ()
+
+    def prefetch_related(self, *args):
+        from .models import generate_reverse_relations
+
+        # reverse relations exist once the models pointing to this one are generated
+        names = [(arg.relation if isinstance(arg, Prefetch) else arg).partition('__')[0] for arg in args]
+        generate_reverse_relations(self.model, names)
+        return super().prefetch_related(*args)
+
+    async def __load(self, loader, field_name, key):
+        instance = await loader.load(self.model, field_name, self._db, key)
+        if instance is None and self._raise_does_not_exist:
+            raise DoesNotExist('Object does not exist')
+        return instance
+
+    def __get_loader_field(self):
+        # only a plain get() or first() by a unique column, e.g. of a foreign key, is batched
+        if not self._single or self._offset or len(self._q_objects) != 1:
+            return None
+        if self._prefetch_map or self._select_related or self._annotations or self._fields_for_select:
+            return None
+        if self._custom_filters or self._having or self._group_bys or self._select_for_update:
+            return None
+
+        q = self._q_objects[0]
+        if q.children or q._is_negated or len(q.filters) != 1:
+            return None
+
+        meta = self.model._meta
+        (lookup,) = q.filters
+        field_name = lookup[:-len('__exact')] if lookup.endswith('__exact') else lookup
+        if field_name == 'pk':
+            field_name = meta.pk_attr
+        field = meta.fields_map.get(field_name)
+        if field is None or field_name not in meta.fields_db_projection or not (field.pk or field.unique):
+            return None
+        return field_name
+
+    async def stream(self, chunk_size=1000):
+        if self._db is None:
+            self._db = self._choose_db()
+
+        executor = self._db.executor_class(
+            model=self.model,
+            db=self._db,
+            prefetch_map=self._prefetch_map,
+            prefetch_queries=self._prefetch_queries,
+            select_related_idx=self._select_related_idx,
+        )
+
+        stream_select = getattr(executor, 'stream_select', None)
+        if stream_select is not None:
+            self._make_query()
+            chunks = stream_select(self.query, list(self._annotations), chunk_size)
+        else:
+            chunks = self.__stream_windows(chunk_size)
+
+        async for chunk in chunks:
+            for instance in chunk:
+                yield instance
+
+    def stream_values(self, *fields, chunk_size=1000):
+        # rows are read in keyset windows on every database, no instances are built;
+        # an unsupported ordering raises here rather than on the first iteration, e.g. in a view
+        self.__is_streamed_descending(self.model._meta.pk_attr)
+        return self.__stream_rows(fields or tuple(self.model._meta.fields_db_projection), chunk_size)
+
+    async def __stream_rows(self, fields, chunk_size):
+        async for chunk in self.__stream_windows(chunk_size, fields):
+            for row in chunk:
+                yield row
+
+    async def __stream_windows(self, chunk_size, fields=None):
+        # keyset windows do not hold a statement (and the connection) open between chunks
+        if len(self._select_related_idx) > 1:
+            raise ValueError('Querysets with select_related() cannot be streamed')
+
+        pk_attr = self.model._meta.pk_attr
+        descending = self.__is_streamed_descending(pk_attr)
+        window_queryset = self.order_by(f'-{pk_attr}' if descending else pk_attr)
+        window_queryset._offset = None
+        next_lookup = f'{pk_attr}__lt' if descending else f'{pk_attr}__gt'
+        remaining, offset, last_pk = self._limit if self._limited else None, self._offset, None
+
+        while remaining is None or remaining > 0:
+            window_size = chunk_size if remaining is None else min(chunk_size, remaining)
+
+            if last_pk is None:
+                window = window_queryset.offset(offset) if offset else window_queryset
+            else:
+                window = window_queryset.filter(**{next_lookup: last_pk})
+
+            if fields is None:
+                chunk = await window.limit(window_size)
+                pks = [instance.pk for instance in chunk[-1:]]
+            else:
+                chunk = await window.limit(window_size).values(*fields, **{STREAM_PK: pk_attr})
+                pks = [row.pop(STREAM_PK) for row in chunk]
+
+            if chunk:
+                yield chunk
+
+            if len(chunk) < window_size:
+                return
+
+            last_pk = pks[-1]
+            if remaining is not None:
+                remaining -= len(chunk)
+
+    def __is_streamed_descending(self, pk_attr):
+        # windows follow the primary key, any other ordering would be lost between them
+        orderings = self._orderings or self.model._meta.ordering
+        if not orderings:
+            return False
+
+        if len(orderings) == 1:
+            field_name, order_type = orderings[0]
+            if field_name in (pk_attr, 'pk'):
+                return order_type == Order.desc
+
+        raise ParamsError('Querysets are streamed in windows of the primary key, order them by pk or -pk only')
+
+
+class Manager(manager.Manager):
+    def get_queryset(self):
+        return QuerySet(self._model)
@@ -0,0 +1,56 @@
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+
+class JsonStreamingResponse(StreamingHttpResponse):
+    def __init__(self, queryset, fields=(), chunk_size=1000, encoder=DjangoJSONEncoder, json_dumps_params=None,
+                 **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        self.chunk_size = chunk_size
+        self.encoder = encoder
+        self.json_dumps_params = json_dumps_params or {}
+        super().__init__(self.__encode_rows(queryset.stream_values(*fields, chunk_size=chunk_size)), **kwargs)
+
+    @property
+    def streaming_content(self):
+        return self._iterator
+
+    @streaming_content.setter
+    def streaming_content(self, value):
+        self._set_streaming_content(value)
+
+    def _set_streaming_content(self, value):
+        # middleware wraps the content in place (e.g. GZipMiddleware), sync wrappers of django < 4.2 cannot read it
+        if not hasattr(value, '__aiter__'):
+            raise TypeError(f'Content of {type(self).__name__} can be wrapped by async iterators only')
+        self._iterator = value
+        self.is_async = True
+
+    def __iter__(self):
+        raise TypeError(f'{type(self).__name__} can be served by the boosted ASGI application only')
+
+    async def __aiter__(self):
+        async for part in self.streaming_content:
+            yield part
+
+    async def __encode_rows(self, rows):
+        # every chunk is sent before the next one is read, so a slow client holds the query back
+        separator = b'['
+        chunk = []
+        async for row in rows:
+            chunk.append(row)
+            if len(chunk) == self.chunk_size:
+                yield separator + self.__encode(chunk)
+                separator, chunk = b',', []
+
+        if chunk:
+            yield separator + self.__encode(chunk)
+            separator = b','
+
+        yield b']' if separator == b',' else b'[]'
+
+    def __encode(self, rows):
+        # the items of the encoded list, the brackets are written once for the whole response
+        return json.dumps(rows, cls=self.encoder, **self.json_dumps_params)[1:-1].encode()
@@ -0,0 +1,26 @@
+import contextvars
+import time
+
+from django.db import router
+
+from .conf import get_setting
+from .models import DJANGO_MODELS
+
+
+_last_write_at = contextvars.ContextVar('django_tortoise_last_write_at', default=None)
+
+
+class DjangoRouter:
+    # routes generated models through the project's DATABASE_ROUTERS
+    def db_for_read(self, model):
+        django_model = DJANGO_MODELS[model]
+
+        last_write_at = _last_write_at.get()
+        if last_write_at is not None and time.monotonic() - last_write_at < get_setting('READ_YOUR_WRITES'):
+            return router.db_for_write(django_model)
+
+        return router.db_for_read(django_model)
+
+    def db_for_write(self, model):
+        _last_write_at.set(time.monotonic())
+        return router.db_for_write(DJANGO_MODELS[model])
@@ -0,0 +1,111 @@
+import base64
+import datetime
+import decimal
+import uuid
+
+from django.db import models
+from django.utils.duration import duration_iso_string
+from tortoise.exceptions import NoValuesFetched
+from tortoise.fields.relational import BackwardFKRelation, BackwardOneToOneRelation, ManyToManyFieldInstance
+
+from .models import get_tortoise_model
+
+
+_serializers = {}  # (tortoise model, fields, related, json) -> compiled serializer
+
+
+def __to_base64(value):
+    return base64.b64encode(value).decode('ascii')
+
+
+def __datetime_to_json(value):
+    # the same strings as DjangoJSONEncoder
+    result = value.isoformat()
+    if value.microsecond:
+        result = result[:23] + result[26:]
+    if result.endswith('+00:00'):
+        result = result[:-6] + 'Z'
+    return result
+
+
+def __time_to_json(value):
+    result = value.isoformat()
+    return result[:12] if value.microsecond else result
+
+
+# field type -> converter of values to python (False) and to JSON (True) types, fields of other types are copied
+CONVERTERS = {
+    memoryview: {False: bytes, True: __to_base64},
+    bytes: {False: bytes, True: __to_base64},
+    decimal.Decimal: {True: str},
+    datetime.timedelta: {True: duration_iso_string},
+    uuid.UUID: {True: str},
+    datetime.datetime: {True: __datetime_to_json},
+    datetime.date: {True: datetime.date.isoformat},
+    datetime.time: {True: __time_to_json},
+}
+
+
+def get_serializer(model, fields=None, related=(), json=False):
+    tortoise_model = get_tortoise_model(model) if issubclass(model, models.Model) else model
+    key = (tortoise_model, None if fields is None else tuple(fields), tuple(sorted(related)), json)
+
+    try:
+        return _serializers[key]
+    except KeyError:
+        return _serializers.setdefault(key, __compile_serializer(tortoise_model, fields, related, json))
+
+
+def __compile_serializer(tortoise_model, fields, related, json):
+    meta = tortoise_model._meta
+
+    related_paths = {}
+    for path in related:
+        name, _, nested_path = path.partition('__')
+        nested_paths = related_paths.setdefault(name, [])
+        if nested_path:
+            nested_paths.append(nested_path)
+
+    if fields is None:
+        # ids of the related instances which are serialized are not repeated
+        source_fields = {meta.fields_map[name].source_field for name in related_paths} - {None}
+        fields = [name for name in meta.fields_db_projection if name not in source_fields]
+
+    namespace = {'NoValuesFetched': NoValuesFetched}
+    items = []
+    for name in fields:
+        field = meta.fields_map[name]
+        value = f'instance.{name}'
+        converter = CONVERTERS.get(field.field_type, {}).get(json)
+        if converter is not None:
+            namespace[f'convert_{name}'] = converter
+            value = f'convert_{name}({value})'
+            if field.null:
+                value = f'None if instance.{name} is None else {value}'
+        items.append(f"'{name}': {value}")
+
+    for name, nested_paths in related_paths.items():
+        if name not in meta.fetch_fields:
+            raise ValueError(f'{name} is not a relation of {tortoise_model.__name__}')
+
+        field = meta.fields_map[name]
+        namespace[f'serialize_{name}'] = get_serializer(field.related_model, related=nested_paths, json=json)
+        many = isinstance(field, (BackwardFKRelation, ManyToManyFieldInstance))
+        if many and not isinstance(field, BackwardOneToOneRelation):
+            items.append(f"'{name}': [serialize_{name}(i) for i in instance._{name}]")
+        else:
+            items.append(f"'{name}': None if instance._{name} is None else serialize_{name}(instance._{name})")
+
+    # relations must be fetched by select_related() or prefetch_related(), the getters would return queries
+    body = ',\n            '.join(items)
+    source = f'''
+def serialize(instance):
+    try:
+        return {{
+            {body}
+        }}
+    except AttributeError as e:
+        raise NoValuesFetched(f'{{instance!r}} is not fetched for serialization: {{e}}') from None
+'''
+    exec(compile(source, f'<serializer of {tortoise_model.__name__}>', 'exec'), namespace)
+    return namespace['serialize']
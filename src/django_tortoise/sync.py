@@ -0,0 +1,86 @@
+import asyncio
+import atexit
+import concurrent.futures
+import functools
+import os
+import threading
+
+from .connections import close_connections, use_connections
+
+
+_loop = None
+_thread = None
+_lock = threading.Lock()
+
+
+def get_background_loop():
+    global _loop, _thread
+
+    with _lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name='django-tortoise-loop', daemon=True)
+            thread.start()
+            _loop, _thread = loop, thread
+
+    return _loop
+
+
+def stop_background_loop(timeout=None):
+    global _loop, _thread
+
+    with _lock:
+        loop, thread = _loop, _thread
+        _loop = _thread = None
+
+    if loop is None:
+        return
+
+    try:
+        asyncio.run_coroutine_threadsafe(close_connections(), loop).result(timeout)
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        if not thread.is_alive():
+            loop.close()
+
+
+def __forget_background_loop():
+    # the thread of the loop does not survive a fork (e.g. celery prefork workers)
+    global _loop, _thread
+    _loop = _thread = None
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=__forget_background_loop)
+atexit.register(stop_background_loop, timeout=5)
+
+
+def run_sync(awaitable, timeout=None):
+    loop = get_background_loop()
+    if threading.current_thread() is _thread:
+        raise RuntimeError('run_sync() cannot be called from the background event loop')
+
+    future = asyncio.run_coroutine_threadsafe(__run(awaitable), loop)
+    try:
+        return future.result(timeout)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise
+
+
+async def __run(awaitable):
+    # pools of the background loop stay open between calls
+    await use_connections()
+    return await awaitable
+
+
+def blocking(func=None, *, timeout=None):
+    if func is None:
+        return functools.partial(blocking, timeout=timeout)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return run_sync(func(*args, **kwargs), timeout)
+
+    return wrapper
@@ -0,0 +1,293 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db import NotSupportedError
+from django.db.models import aggregates, ForeignObjectRel, query
+from django.db.models.expressions import Col, CombinedExpression, Value
+from django.db.models.sql.datastructures import Join
+from django.db.models.sql.where import WhereNode
+from pypika import Table
+from tortoise import functions
+from tortoise.expressions import F, Q
+
+
+LOOKUPS = {
+    'exact': None,
+    'iexact': 'iexact',
+    'gt': 'gt',
+    'gte': 'gte',
+    'lt': 'lt',
+    'lte': 'lte',
+    'in': 'in',
+    'range': 'range',
+    'isnull': 'isnull',
+    'contains': 'contains',
+    'icontains': 'icontains',
+    'startswith': 'startswith',
+    'istartswith': 'istartswith',
+    'endswith': 'endswith',
+    'iendswith': 'iendswith',
+}
+
+AGGREGATES = {
+    aggregates.Avg: functions.Avg,
+    aggregates.Count: functions.Count,
+    aggregates.Max: functions.Max,
+    aggregates.Min: functions.Min,
+    aggregates.Sum: functions.Sum,
+}
+
+CONNECTORS = {'+', '-', '*', '/'}
+
+
+def as_abjects(queryset):
+    django_model = queryset.model
+    tortoise_model = getattr(django_model, 'abjects', None)
+    if tortoise_model is None:
+        raise NotSupportedError(f'{django_model._meta.label} is not patched by django-tortoise')
+
+    sql_query = queryset.query
+    __check_supported(sql_query)
+
+    paths = __get_alias_paths(sql_query)
+    annotations = {
+        name: __translate_annotation(name, annotation, paths) for name, annotation in sql_query.annotations.items()
+    }
+
+    abjects_queryset = tortoise_model._meta.manager.get_queryset()
+    if annotations:
+        abjects_queryset = abjects_queryset.annotate(**annotations)
+
+    if sql_query.where:
+        abjects_queryset = abjects_queryset.filter(__translate_node(sql_query.where, sql_query, paths))
+
+    if sql_query.order_by:
+        abjects_queryset = abjects_queryset.order_by(*(
+            __translate_ordering(django_model, ordering, annotations) for ordering in sql_query.order_by
+        ))
+
+    if sql_query.select_related:
+        abjects_queryset = abjects_queryset.select_related(*(
+            __translate_path(django_model, path) for path in __get_select_related_paths(sql_query.select_related)
+        ))
+
+    if sql_query.distinct:
+        abjects_queryset = abjects_queryset.distinct()
+
+    if sql_query.low_mark:
+        abjects_queryset = abjects_queryset.offset(sql_query.low_mark)
+    if sql_query.high_mark is not None:
+        abjects_queryset = abjects_queryset.limit(sql_query.high_mark - sql_query.low_mark)
+
+    only_fields, defer = sql_query.deferred_loading
+    if only_fields and not defer:
+        abjects_queryset = abjects_queryset.only(*(__translate_path(django_model, path) for path in only_fields))
+
+    if isinstance(sql_query.group_by, tuple):
+        abjects_queryset = abjects_queryset.group_by(*(
+            __translate_expression(col, paths) for col in sql_query.group_by
+        ))
+
+    return __translate_iterable(queryset, abjects_queryset)
+
+
+def __check_supported(sql_query):
+    unsupported = {
+        'combinator': sql_query.combinator,
+        'extra': sql_query.extra,
+        'extra tables': sql_query.extra_tables,
+        'distinct fields': sql_query.distinct_fields,
+        'select_for_update': sql_query.select_for_update,
+        'defer': sql_query.deferred_loading[1] and sql_query.deferred_loading[0],
+        'select_related() of all relations': sql_query.select_related is True,
+        'filtered relations': sql_query._filtered_relations,
+    }
+    for name, value in unsupported.items():
+        if value:
+            raise NotSupportedError(f'{name} cannot be translated to a Tortoise query')
+
+
+def __get_alias_paths(sql_query):
+    # django table alias -> (tortoise lookup path, django model, far field of a through table)
+    paths, seen_paths = {}, set()
+    for alias, join in sql_query.alias_map.items():
+        if not isinstance(join, Join):
+            paths[alias] = ((), sql_query.model, None)
+            continue
+
+        parent_path, parent_model, _ = paths[join.parent_alias]
+        join_field = join.join_field
+        related_model = join_field.related_model
+        far_field = None
+
+        if parent_model._meta.auto_created:
+            # the far side of a many-to-many relation, its name was added with the through table
+            path = parent_path
+        elif related_model._meta.auto_created:
+            path = (*parent_path, __get_many_to_many_name(join_field))
+            (far_field,) = [
+                field for field in related_model._meta.concrete_fields
+                if field.is_relation and field is not join_field.field
+            ]
+        elif isinstance(join_field, ForeignObjectRel):
+            path = (*parent_path, join_field.get_accessor_name())
+        else:
+            path = (*parent_path, join_field.name)
+
+        # tortoise joins every relation once, e.g. for chained filter() calls over multi-valued relations
+        if (path, related_model) in seen_paths:
+            raise NotSupportedError(f'{"__".join(path)} is joined several times')
+        seen_paths.add((path, related_model))
+
+        paths[alias] = (path, related_model, far_field)
+
+    return paths
+
+
+def __get_many_to_many_name(join_field):
+    through = join_field.related_model
+    for field in through._meta.auto_created._meta.local_many_to_many:
+        if field.remote_field.through is through:
+            if join_field.field.name == field.m2m_field_name():
+                return field.name
+            return field.remote_field.get_accessor_name()
+
+    raise NotSupportedError(f'Relation through {through._meta.label} cannot be translated')
+
+
+def __translate_node(node, sql_query, paths):
+    if not isinstance(node, WhereNode) or node.connector not in (Q.AND, Q.OR):
+        raise NotSupportedError(f'{node!r} cannot be translated to a Tortoise filter')
+
+    children = []
+    for child in node.children:
+        if isinstance(child, WhereNode):
+            children.append(__translate_node(child, sql_query, paths))
+        else:
+            children.append(__translate_lookup(child, sql_query, paths))
+
+    q = Q(*children, join_type=node.connector)
+    return ~q if node.negated else q
+
+
+def __translate_lookup(lookup, sql_query, paths):
+    lookup_name = getattr(lookup, 'lookup_name', None)
+    if lookup_name not in LOOKUPS:
+        raise NotSupportedError(f'{lookup!r} cannot be translated to a Tortoise filter')
+
+    if isinstance(lookup.lhs, Col):
+        key = __translate_column(lookup.lhs, paths)
+    else:
+        # e.g. filter() over an aggregate, tortoise moves it to HAVING as django does
+        names = [name for name, annotation in sql_query.annotations.items() if annotation is lookup.lhs]
+        if not names:
+            raise NotSupportedError(f'{lookup.lhs!r} cannot be translated to a Tortoise filter')
+        key = names[0]
+
+    if LOOKUPS[lookup_name]:
+        key = f'{key}__{LOOKUPS[lookup_name]}'
+
+    rhs = lookup.rhs
+    if hasattr(rhs, 'resolve_expression'):
+        rhs = __translate_expression(rhs, paths, columns=True)
+    elif isinstance(rhs, (list, tuple)) and any(hasattr(value, 'resolve_expression') for value in rhs):
+        raise NotSupportedError(f'{lookup!r} cannot be translated to a Tortoise filter')
+
+    return Q(**{key: rhs})
+
+
+def __translate_column(col, paths):
+    path, model, far_field = paths[col.alias]
+    target = col.target
+
+    if model._meta.auto_created:
+        # the far column of a through table is the primary key of the related model
+        if target is not far_field:
+            raise NotSupportedError(f'{col!r} cannot be translated to a Tortoise filter')
+        return '__'.join((*path, target.target_field.name))
+
+    return '__'.join((*path, target.attname if target.is_relation else target.name))
+
+
+def __translate_expression(expression, paths, columns=False):
+    if isinstance(expression, Col):
+        path, model, _ = paths[expression.alias]
+        if not columns:
+            return __translate_column(expression, paths)
+        if path:
+            raise NotSupportedError(f'{expression!r} of a related model cannot be compared in a Tortoise filter')
+        return F(expression.target.column, table=Table(model._meta.db_table))
+
+    if columns and isinstance(expression, Value):
+        return expression.value
+
+    if columns and isinstance(expression, CombinedExpression) and expression.connector in CONNECTORS:
+        lhs = __translate_expression(expression.lhs, paths, columns=True)
+        rhs = __translate_expression(expression.rhs, paths, columns=True)
+        return {'+': lhs + rhs, '-': lhs - rhs, '*': lhs * rhs, '/': lhs / rhs}[expression.connector]
+
+    raise NotSupportedError(f'{expression!r} cannot be translated to a Tortoise expression')
+
+
+def __translate_annotation(name, annotation, paths):
+    function = AGGREGATES.get(type(annotation))
+    source_expressions = annotation.get_source_expressions()
+    if function is None or annotation.filter is not None or len(source_expressions) != 1:
+        raise NotSupportedError(f'Annotation {name}={annotation!r} cannot be translated to a Tortoise function')
+
+    return function(__translate_expression(source_expressions[0], paths), distinct=annotation.distinct)
+
+
+def __translate_path(model, path):
+    names = []
+    for name in path.split('__'):
+        if model is None:
+            raise NotSupportedError(f'{path} cannot be translated to a Tortoise lookup')
+
+        meta = model._meta
+        try:
+            field = meta.pk if name == 'pk' else meta.get_field(name)
+        except FieldDoesNotExist:
+            raise NotSupportedError(f'{path} cannot be translated to a Tortoise lookup')
+
+        names.append(field.get_accessor_name() if isinstance(field, ForeignObjectRel) else field.name)
+        model = field.related_model
+
+    return '__'.join(names)
+
+
+def __translate_ordering(model, ordering, annotations):
+    if not isinstance(ordering, str) or ordering == '?':
+        raise NotSupportedError(f'Ordering by {ordering!r} cannot be translated to a Tortoise query')
+
+    descending = ordering.startswith('-')
+    name = ordering.lstrip('-')
+    if name not in annotations:
+        name = __translate_path(model, name)
+
+    return f'-{name}' if descending else name
+
+
+def __get_select_related_paths(select_related, prefix=''):
+    for name, nested in select_related.items():
+        if nested:
+            yield from __get_select_related_paths(nested, f'{prefix}{name}__')
+        else:
+            yield f'{prefix}{name}'
+
+
+def __translate_iterable(queryset, abjects_queryset):
+    iterable_class = queryset._iterable_class
+    if iterable_class is query.ModelIterable:
+        return abjects_queryset
+
+    sql_query = queryset.query
+    fields = [__translate_path(queryset.model, name) for name in sql_query.values_select]
+    fields.extend(sql_query.annotation_select)
+
+    if iterable_class is query.ValuesIterable:
+        return abjects_queryset.values(*fields)
+    if iterable_class is query.ValuesListIterable:
+        return abjects_queryset.values_list(*fields)
+    if iterable_class is query.FlatValuesListIterable:
+        return abjects_queryset.values_list(*fields, flat=True)
+
+    raise NotSupportedError(f'{iterable_class.__name__} cannot be translated to a Tortoise query')
@@ -39,6 +39,8 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
 
+    'django_tortoise',
+
     'test_app_a',
     'test_app_b'
 ]
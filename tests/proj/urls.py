@@ -13,11 +13,14 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from asgiref.sync import sync_to_async
 from django.contrib import admin
 from django.contrib.auth.models import User
 from django.http import JsonResponse
 from django.urls import path
 
+from django_tortoise.responses import JsonStreamingResponse
+
 
 async def get_users(request):
     users = await User.abjects.all()
@@ -31,9 +34,40 @@ async def get_users(request):
     return JsonResponse({'users': users_dict})
 
 
+def get_users_sync(request):
+    users = User.objects.all()
+    users_dict = [
+        {
+            'user': user.username,
+            'is_superuser': user.is_superuser
+        }
+        for user in users
+    ]
+    return JsonResponse({'users': users_dict})
+
+
+async def get_users_sync_to_async(request):
+    users = await sync_to_async(list)(User.objects.all())
+    users_dict = [
+        {
+            'user': user.username,
+            'is_superuser': user.is_superuser
+        }
+        for user in users
+    ]
+    return JsonResponse({'users': users_dict})
+
+
+async def get_users_stream(request):
+    return JsonStreamingResponse(User.abjects.all(), fields=('username', 'is_superuser'))
+
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('users/', get_users),
+    path('users/sync/', get_users_sync),
+    path('users/sync-to-async/', get_users_sync_to_async),
+    path('users/stream/', get_users_stream),
 ]
 
 
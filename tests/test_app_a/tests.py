@@ -1,16 +1,77 @@
+import asyncio
+import base64
+import concurrent.futures
+import contextvars
+import datetime
+import gzip
+import importlib.util
+import json
+import threading
+import uuid
+
+from pathlib import Path
+
 import django
 import pytest
 
+from django.apps import apps
 from django.contrib.admin.models import LogEntry
 from django.contrib.auth.models import Group, Permission, User
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.sessions.models import Session
-from django.test import override_settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.core.management import call_command, CommandError
+from django.db import connection as django_connection, NotSupportedError
+from django.db.models import Count, F, Q
+from django.db.models.functions import Lower
+from django.middleware.gzip import GZipMiddleware
+from django.test import override_settings, RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from asgiref.testing import ApplicationCommunicator
+from tortoise import Tortoise
+from tortoise.connection import connections
+from tortoise.exceptions import DoesNotExist, NoValuesFetched, ParamsError
+
+from django_tortoise import models as tortoise_models
+from django_tortoise.asgi import BoostedASGIHandler, LoaderMiddleware
+from django_tortoise.backends.base import hydrate
+from django_tortoise.backends.sqlite import SqliteClient
+from django_tortoise.bus import get_payloads, InvalidationBus, LocalInvalidationBus
+from django_tortoise.codegen import get_fingerprint
+from django_tortoise.conversion import to_django, to_tortoise
+from django_tortoise.deferred import BATCH, fetch_deferred
+from django_tortoise.fields import DurationField, LazyJSON, LazyJSONAttribute, TimeField
+from django_tortoise.connections import _loop_connections, close_connections, open_connections
+from django_tortoise.instrumentation import add_query_callback, remove_query_callback
+from django_tortoise.models import (
+    TORTOISE_MODELS,
+    _LazyReverseRelation,
+    _LazyTortoiseModel,
+    generate_reverse_relations,
+    get_tortoise_field_factories,
+    get_tortoise_model,
+    __get_postgresql_credentials,
+    __get_sqlite_credentials,
+    __is_patched,
+)
+from django_tortoise.responses import JsonStreamingResponse
+from django_tortoise.routers import DjangoRouter
+from django_tortoise.serializers import get_serializer
+from django_tortoise.sync import blocking, run_sync, stop_background_loop
 
 from .models import ModelA, ModelARel
 from .serializers import serialize_model_a, serialize_model_a_rel
 
 
+class RecordRow(dict):
+    # keys() of asyncpg records returns an iterator
+    def keys(self):
+        return iter(super().keys())
+
+
 @pytest.mark.parametrize(
     'model', [
         LogEntry,
@@ -27,6 +88,111 @@ def test_check_if_model_is_monkey_patched(model):
     assert hasattr(model, 'abjects')
 
 
+@pytest.mark.parametrize(
+    'include, exclude, patched', [
+        (None, (), True),
+        (['test_app_a'], (), True),
+        (['test_app_a.ModelA'], (), True),
+        (['auth'], (), False),
+        (None, ['test_app_a'], False),
+        (None, ['test_app_a.modela'], False),
+        (['test_app_a'], ['test_app_a.ModelA'], False),
+    ]
+)
+def test_patched_models_selection(include, exclude, patched):
+    with override_settings(DJANGO_TORTOISE={'INCLUDE': include, 'EXCLUDE': exclude}):
+        assert __is_patched('test_app_a', 'modela') is patched
+
+
+def test_tortoise_model_is_generated_on_first_access():
+    tortoise_model = ModelARel.abjects
+
+    assert ModelARel.__dict__['abjects'] is tortoise_model
+    assert TORTOISE_MODELS[ModelARel] is tortoise_model
+    # related models are generated together
+    assert ModelA in TORTOISE_MODELS
+
+
+def test_reverse_relations_are_generated_on_first_use(monkeypatch):
+    # a fresh generation, detached from the initialized Tortoise
+    for registry in ('SYMBIOTIC_MODELS', 'DJANGO_MODELS', 'TORTOISE_MODELS', 'REVERSE_RELATIONS'):
+        monkeypatch.setattr(tortoise_models, registry, {})
+    monkeypatch.setattr(tortoise_models, '__models__', [])
+    monkeypatch.setattr(Tortoise, '_inited', False)
+    for django_model in apps.get_models():
+        if 'abjects' in django_model.__dict__:
+            monkeypatch.setattr(django_model, 'abjects', _LazyTortoiseModel(django_model))
+
+    tortoise_model = ContentType.abjects
+
+    # the models pointing to content types are left untouched
+    assert set(tortoise_models.TORTOISE_MODELS) == {ContentType}
+    assert tortoise_models.REVERSE_RELATIONS[tortoise_model] == {'logentry_set': LogEntry, 'permission_set': Permission}
+    assert isinstance(tortoise_model.__dict__['permission_set'], _LazyReverseRelation)
+
+    generate_reverse_relations(tortoise_model, ['permission_set'])
+
+    assert set(tortoise_models.TORTOISE_MODELS) == {ContentType, Permission}
+    assert tortoise_models.REVERSE_RELATIONS[tortoise_model] == {'logentry_set': LogEntry}
+
+
+def test_generate_tortoise_models_command(tmp_path):
+    output = tmp_path / 'tortoise_models.py'
+
+    with pytest.raises(CommandError):
+        call_command('generate_tortoise_models', output=output, check=True)
+
+    call_command('generate_tortoise_models', output=output)
+    call_command('generate_tortoise_models', output=output, check=True)
+
+    spec = importlib.util.spec_from_file_location('tortoise_models', output)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    assert module.FINGERPRINT == get_fingerprint(apps)
+    static_model = module.MODELS['test_app_a.ModelA']
+    assert set(static_model._meta.fields_map) == set(get_tortoise_field_factories(ModelA))
+    assert static_model._meta.db_table == ModelA._meta.db_table
+
+
+def test_fingerprint_hashes_migration_contents(tmp_path, monkeypatch):
+    migrations = tmp_path / 'fingerprint_migrations'
+    migrations.mkdir()
+    (migrations / '__init__.py').write_text('')
+    migration = migrations / '0001_initial.py'
+    migration.write_text((Path(__file__).parent / 'migrations' / '0001_initial.py').read_text())
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    with override_settings(MIGRATION_MODULES={'test_app_a': 'fingerprint_migrations'}):
+        fingerprint = get_fingerprint(apps)
+        migration.write_text(migration.read_text().replace('max_length=20', 'max_length=30'))
+
+        assert get_fingerprint(apps) != fingerprint
+
+
+@pytest.mark.django_db
+@pytest.mark.asyncio
+async def test_hydrated_instances_match_tortoise_instances(generate_a_as_dict, monkeypatch):
+    for _ in range(3):
+        ModelA.objects.create(**generate_a_as_dict())
+
+    _, rows = await connections.get('default').execute_query(f'SELECT * FROM {ModelA._meta.db_table}')
+
+    hydrated = [serialize_model_a(instance) for instance in hydrate(ModelA.abjects, rows)]
+    initialized = [serialize_model_a(ModelA.abjects._init_from_db(**row)) for row in rows]
+
+    assert hydrated == initialized
+    assert hydrate(ModelA.abjects, []) == []
+
+    def init_from_db(**row):
+        raise AssertionError('rows with every column are hydrated by columns')
+
+    # asyncpg records
+    record_rows = [RecordRow(row) for row in rows]
+    monkeypatch.setattr(get_tortoise_model(ModelA), '_init_from_db', init_from_db)
+    assert [serialize_model_a(instance) for instance in hydrate(ModelA.abjects, record_rows)] == initialized
+
+
 @pytest.mark.parametrize(
     'use_tz', [
         True,
@@ -158,3 +324,651 @@ async def test_model_b_creat_through_tortoise(generate_a_as_dict, use_tz):
         a_rel_dict_tortoise = serialize_model_a_rel(instance_a_rel_tortoise)
 
         assert a_rel_dict_django == a_rel_dict_tortoise
+
+
+def test_postgresql_pool_credentials():
+    credentials = __get_postgresql_credentials({
+        'NAME': 'postgres',
+        'USER': 'user',
+        'PASSWORD': 'password',
+        'HOST': '127.0.0.1',
+        'PORT': 5432,
+        'CONN_MAX_AGE': None,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {'sslmode': 'require', 'application_name': 'proj'},
+        'POOL': {'MIN_SIZE': 2, 'MAX_SIZE': 20, 'STATEMENT_CACHE_SIZE': 0},
+    })
+
+    assert credentials['minsize'] == 2
+    assert credentials['maxsize'] == 20
+    assert credentials['statement_cache_size'] == 0
+    assert credentials['max_inactive_connection_lifetime'] == 0
+    assert credentials['ssl'] == 'require'
+    assert credentials['application_name'] == 'proj'
+    assert callable(credentials['setup'])
+
+
+def test_sqlite_credentials():
+    credentials = __get_sqlite_credentials({
+        'NAME': 'db.sqlite3',
+        'OPTIONS': {'timeout': 5},
+        'PRAGMAS': {'synchronous': 'NORMAL', 'mmap_size': 268435456},
+        'POOL': {'MAX_SIZE': 4},
+    })
+
+    assert credentials == {
+        'file_path': 'db.sqlite3',
+        'busy_timeout': 5000,
+        'synchronous': 'NORMAL',
+        'mmap_size': 268435456,
+        'read_pool_size': 4,
+    }
+
+
+def test_uncompiled_converters(monkeypatch):
+    time, duration = datetime.time(12, 30), datetime.timedelta(seconds=90)
+    monkeypatch.setattr(tortoise_models, 'DB_BACKEND', 'sqlite3')
+
+    # fields are compiled for the backend on first use
+    assert TimeField(auto_now=False, auto_now_add=False).to_db_value(time, None) == '12:30:00'
+    assert DurationField().to_db_value(duration, None) == 90000000
+
+
+@pytest.mark.asyncio
+async def test_sqlite_read_pool(tmp_path):
+    client = SqliteClient(
+        str(tmp_path / 'db.sqlite3'), read_pool_size=2, synchronous='NORMAL', busy_timeout=1000, connection_name='test'
+    )
+    await client.create_connection(with_db=True)
+    try:
+        await client.execute_script('CREATE TABLE item (id INTEGER PRIMARY KEY, name TEXT)')
+        await client.execute_insert('INSERT INTO item (name) VALUES (?)', ['a'])
+
+        async with client._lock:
+            # reads do not wait for the writer connection
+            results = await asyncio.gather(*(client.execute_query('SELECT name FROM item') for _ in range(4)))
+        assert [[row['name'] for row in rows] for _, rows in results] == [['a']] * 4
+
+        assert [dict(row) for row in await client.execute_query_dict('PRAGMA busy_timeout')] == [{'timeout': 1000}]
+        assert client._readers.qsize() == 2
+
+        _, [journal_mode] = await client.execute_query('PRAGMA journal_mode')
+        assert journal_mode[0] == 'wal'
+    finally:
+        await client.close()
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return 'replica'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+
+@pytest.mark.parametrize('read_your_writes, read_db_after_write', [(0, 'replica'), (60, 'default')])
+def test_router_read_your_writes(read_your_writes, read_db_after_write):
+    def route():
+        router = DjangoRouter()
+        return [
+            router.db_for_read(ModelA.abjects),
+            router.db_for_write(ModelA.abjects),
+            router.db_for_read(ModelA.abjects),
+        ]
+
+    routers = ['test_app_a.tests.ReplicaRouter']
+    with override_settings(DATABASE_ROUTERS=routers, DJANGO_TORTOISE={'READ_YOUR_WRITES': read_your_writes}):
+        # a new context is a new request
+        assert contextvars.Context().run(route) == ['replica', 'default', read_db_after_write]
+
+
+def test_loop_connections_are_closed_with_their_loop(event_loop):
+    async def open_loop_connections():
+        storage = await open_connections()
+        return asyncio.get_running_loop(), storage
+
+    # asyncio.run() without any lifespan shutdown, e.g. a server without lifespan support
+    try:
+        loop, storage = asyncio.run(open_loop_connections())
+    finally:
+        asyncio.set_event_loop(event_loop)
+
+    assert loop not in _loop_connections
+    assert all(client._connection is None for client in storage.values())
+
+
+@pytest.mark.django_db
+@pytest.mark.asyncio
+async def test_lifespan_opens_and_closes_loop_connections(event_loop):
+    app = BoostedASGIHandler(ASGIHandler())
+
+    lifespan = ApplicationCommunicator(app, {'type': 'lifespan'})
+    await lifespan.send_input({'type': 'lifespan.startup'})
+    assert await lifespan.receive_output() == {'type': 'lifespan.startup.complete'}
+    try:
+        storage = _loop_connections[event_loop].result()
+        assert set(storage) == set(connections.db_config)
+
+        request = ApplicationCommunicator(app, {
+            'type': 'http',
+            'method': 'GET',
+            'path': '/users/',
+            'query_string': b'',
+            'headers': [(b'host', b'testserver')],
+        })
+        await request.send_input({'type': 'http.request', 'body': b''})
+        assert (await request.receive_output())['status'] == 200
+        await request.receive_output()
+    finally:
+        await lifespan.send_input({'type': 'lifespan.shutdown'})
+        assert await lifespan.receive_output() == {'type': 'lifespan.shutdown.complete'}
+
+    assert event_loop not in _loop_connections
+
+
+@pytest.mark.django_db
+@pytest.mark.asyncio
+async def test_query_instrumentation(caplog):
+    username = uuid.uuid4().hex
+    User.objects.create(username=username)
+
+    records = []
+    add_query_callback(records.append)
+    try:
+        with override_settings(DJANGO_TORTOISE={'SLOW_QUERY_THRESHOLD': 0}):
+            users = await User.abjects.filter(username=username)
+    finally:
+        remove_query_callback(records.append)
+
+    [record] = records
+    assert record.alias == 'default'
+    assert 'SELECT' in record.sql and record.rowcount == len(users) == 1
+    assert record.duration >= record.connection_wait >= 0
+    assert record.exception is None
+
+    [log_record] = [log_record for log_record in caplog.records if log_record.name == 'django_tortoise.queries']
+    assert log_record.levelname == 'WARNING' and log_record.sql == record.sql
+
+
+@pytest.mark.django_db
+@pytest.mark.asyncio
+async def test_query_cache_requires_async_cache_api(monkeypatch):
+    with override_settings(DJANGO_TORTOISE={'CACHE': {'test_app_a.ModelA': {'TIMEOUT': 60}}}):
+        with monkeypatch.context() as patch, pytest.raises(ImproperlyConfigured):
+            patch.setattr(django, 'VERSION', (3, 2, 0, 'final', 0))
+            await ModelA.abjects.filter(id=-1)
+
+
+@pytest.mark.django_db
+@pytest.mark.asyncio
+async def test_query_cache_invalidation(generate_a_as_dict):
+    instance = ModelA.objects.create(**generate_a_as_dict())
+
+    records = []
+    add_query_callback(records.append)
+    try:
+        cache_conf = {'test_app_a.ModelA': {'TIMEOUT': 60, 'MAX_ENTRIES_PER_PROCESS': 1}}
+        with override_settings(DJANGO_TORTOISE={'CACHE': cache_conf}):
+            async def get_char():
+                selects_before = sum(record.sql.startswith('SELECT') for record in records)
+                char = (await ModelA.abjects.get(id=instance.id)).char
+                return char, sum(record.sql.startswith('SELECT') for record in records) - selects_before
+
+            assert await get_char() == (instance.char, 1)
+            assert await get_char() == (instance.char, 0)
+
+            # a django write
+            instance.char = 'django'
+            instance.save()
+            assert await get_char() == ('django', 1)
+
+            # a tortoise write
+            await ModelA.abjects.filter(id=instance.id).update(char='tortoise')
+            assert await get_char() == ('tortoise', 1)
+            assert await get_char() == ('tortoise', 0)
+
+            # the only entry is evicted by another query
+            await ModelA.abjects.filter(id=instance.id, char='tortoise')
+            assert await get_char() == ('tortoise', 1)
+    finally:
+        remove_query_callback(records.append)
+
+
+@pytest.mark.asyncio
+async def test_invalidation_bus_coalesces_notifications():
+    received = {'a': [], 'b': []}
+    bus_a, bus_b = LocalInvalidationBus(received['a'].append), LocalInvalidationBus(received['b'].append)
+
+    with override_settings(DJANGO_TORTOISE={'INVALIDATION_DELAY': 0.05}):
+        await bus_a.start()
+        await bus_b.start()
+        try:
+            bus_a.publish({'table_a'})
+            bus_a.publish({'table_a', 'table_b'})
+            thread = threading.Thread(target=bus_a.publish, args=({'table_c'},))
+            thread.start()
+            thread.join()
+            await asyncio.sleep(0.2)
+        finally:
+            await bus_a.stop()
+            await bus_b.stop()
+
+    assert received == {'a': [], 'b': [{'table_a', 'table_b', 'table_c'}]}
+    assert list(get_payloads({'table_a', 'table_b', 'table_c'}, max_length=15)) == ['table_a,table_b', 'table_c']
+
+
+class ThreadRecordingBus(LocalInvalidationBus):
+    def __init__(self):
+        super().__init__()
+        self.threads = []
+
+    def _send_now(self, tables):
+        self.threads.append(threading.current_thread())
+
+
+@pytest.mark.asyncio
+async def test_unstarted_invalidation_bus_sends_off_the_event_loop():
+    with pytest.raises(TypeError):
+        InvalidationBus()
+
+    bus = ThreadRecordingBus()
+    await bus.apublish({'table_a'})
+    bus.publish({'table_b'})
+    for _ in range(100):
+        if len(bus.threads) == 2:
+            break
+        await asyncio.sleep(0.01)
+
+    assert len(bus.threads) == 2 and threading.current_thread() not in bus.threads
+
+
+@pytest.mark.django_db
+@pytest.mark.asyncio
+async def test_queryset_streaming(generate_a_as_dict):
+    ids = [ModelA.objects.create(**generate_a_as_dict()).id for _ in range(5)]
+    queryset = ModelA.abjects.filter(id__in=ids)
+
+    assert [instance.id async for instance in queryset.stream(chunk_size=2)] == sorted(ids)
+    assert [instance.id async for instance in queryset.limit(3).offset(1).stream(chunk_size=2)] == sorted(ids)[1:4]
+    # offset() alone limits sqlite queries to a million rows, which must not end the stream
+    records = []
+    add_query_callback(records.append)
+    try:
+        assert [instance.id async for instance in queryset.offset(1).stream(chunk_size=2000000)] == sorted(ids)[1:]
+    finally:
+        remove_query_callback(records.append)
+    assert all('LIMIT 1000000 ' not in record.sql for record in records)
+    descending = queryset.order_by('-id')
+    assert [instance.id async for instance in descending.stream(chunk_size=2)] == sorted(ids, reverse=True)
+    assert [row['id'] async for row in descending.stream_values('id', chunk_size=2)] == sorted(ids, reverse=True)
+    with pytest.raises(ParamsError):
+        [instance async for instance in queryset.order_by('char').stream()]
+
+    stream = queryset.stream(chunk_size=2)
+    first = await stream.__anext__()
+    await stream.aclose()
+    assert first.id == min(ids) and serialize_model_a(first) == serialize_model_a(await queryset.get(id=first.id))
+
+
+@pytest.mark.django_db
+@pytest.mark.asyncio
+async def test_bulk_copy(generate_a_as_dict):
+    async def generate_objects():
+        for _ in range(3):
+            yield generate_a_as_dict()
+
+    max_id = ModelA.objects.order_by('-id').values_list('id', flat=True).first() or 0
+    assert await ModelA.abjects.bulk_copy(generate_objects(), chunk_size=2) == 3
+
+    copied = ModelA.objects.filter(id__gt=max_id)
+    assert len(copied) == 3
+    assert [serialize_model_a(instance) for instance in copied] == [
+        serialize_model_a(instance) for instance in await ModelA.abjects.filter(id__gt=max_id).order_by('id')
+    ]
+
+    with pytest.raises(ValidationError):
+        await ModelA.abjects.bulk_copy([{**generate_a_as_dict(), 'ip': 'not an ip'}])
+
+
+@pytest.mark.django_db
+@pytest.mark.asyncio
+async def test_bulk_upsert():
+    prefix = uuid.uuid4().hex[:8]
+
+    def generate_users(numbers, first_name):
+        for number in numbers:
+            yield {
+                'username': f'{prefix}-{number}',
+                'password': '',
+                'first_name': first_name,
+                'last_name': '',
+                'email': f'{prefix}@example.com',
+            }
+
+    try:
+        # the unique username is the conflict target
+        assert await User.abjects.bulk_upsert(generate_users(range(2500), 'old'), chunk_size=1000) == (2500, 0)
+        assert await User.abjects.bulk_upsert(
+            generate_users(range(1500, 3000), 'new'), update_fields=['first_name'], chunk_size=1000
+        ) == (500, 1000)
+
+        first_names = dict(User.objects.filter(username__startswith=prefix).values_list('username', 'first_name'))
+        assert len(first_names) == 3000
+        assert first_names[f'{prefix}-1499'] == 'old' and first_names[f'{prefix}-1500'] == 'new'
+    finally:
+        User.objects.filter(username__startswith=prefix).delete()
+
+    with pytest.raises(ValueError):
+        await User.abjects.bulk_upsert([], conflict_field='first_name')
+    with pytest.raises(ValueError):
+        await User.abjects.bulk_upsert(generate_users(range(2), 'unsaved'), conflict_field='id')
+    assert not User.objects.filter(username__startswith=prefix).exists()
+
+
+@pytest.mark.django_db
+def test_sync_bridge():
+    @blocking
+    async def count_users():
+        return await User.abjects.all().count()
+
+    async def fail():
+        raise KeyError('failed')
+
+    try:
+        assert count_users() == count_users() == User.objects.count()
+        assert run_sync(User.abjects.filter(id=-1)) == []
+
+        with pytest.raises(KeyError):
+            run_sync(fail())
+        with pytest.raises(concurrent.futures.TimeoutError):
+            run_sync(asyncio.sleep(1), timeout=0.01)
+    finally:
+        stop_background_loop()
+
+
+@pytest.mark.django_db
+@pytest.mark.asyncio
+async def test_reverse_relations_prefetch(generate_a_as_dict):
+    parents = [ModelA.objects.create(**generate_a_as_dict()) for _ in range(3)]
+    for parent in parents:
+        rel = ModelARel.objects.create(one=parent, foreign=parent)
+        rel.many.set(parents)
+
+    records = []
+    add_query_callback(records.append)
+    try:
+        queryset = ModelA.abjects.filter(id__in=[parent.id for parent in parents]).order_by('id')
+        instances = await queryset.prefetch_related('one', 'foreigns', 'many')
+    finally:
+        remove_query_callback(records.append)
+
+    # a query per relation, not per parent
+    assert len(records) == 4
+    for parent, instance in zip(parents, instances):
+        assert instance.one.id == parent.one.id
+        assert [rel.id for rel in instance.foreigns] == [rel.id for rel in parent.foreigns.all()]
+        assert sorted(rel.id for rel in instance.many) == sorted(rel.id for rel in parent.many.all())
+
+
+@pytest.mark.django_db
+@pytest.mark.asyncio
+async def test_request_loader_batches_lookups(generate_a_as_dict):
+    parents = [ModelA.objects.create(**generate_a_as_dict()) for _ in range(3)]
+    rels = [ModelARel.objects.create(one=parent, foreign=parent) for parent in parents]
+
+    async def view(scope, receive, send):
+        instances = await asyncio.gather(
+            *(ModelARel.abjects.get(id=rel.id) for rel in rels), ModelARel.abjects.get(pk=rels[0].id)
+        )
+        foreigns = await asyncio.gather(*(instance.foreign for instance in instances))
+        missing = await ModelA.abjects.filter(id=0).first()
+        with pytest.raises(DoesNotExist):
+            await ModelA.abjects.get(id=0)
+        return instances, foreigns, missing
+
+    records = []
+    add_query_callback(records.append)
+    try:
+        instances, foreigns, missing = await LoaderMiddleware(view)({'type': 'http'}, None, None)
+    finally:
+        remove_query_callback(records.append)
+
+    # one query per model and tick, duplicated keys share an instance
+    assert len(records) == 4
+    assert [instance.id for instance in instances] == [rel.id for rel in rels] + [rels[0].id]
+    assert instances[0] is instances[-1]
+    assert [foreign.id for foreign in foreigns] == [parent.id for parent in parents] + [parents[0].id]
+    assert missing is None
+
+
+@pytest.mark.django_db
+@pytest.mark.asyncio
+async def test_instance_conversion(generate_a_as_dict):
+    parent = ModelA.objects.create(**generate_a_as_dict())
+    rel = ModelARel.objects.create(one=parent, foreign=parent)
+
+    instances = await ModelA.abjects.filter(id=parent.id)
+    rel_instances = await ModelARel.abjects.filter(id=rel.id)
+
+    with CaptureQueriesContext(django_connection) as queries:
+        (instance,), (rel_instance,) = to_django(instances), to_django(rel_instances)
+        assert serialize_model_a(instance) == serialize_model_a(ModelA.objects.get(id=parent.id))
+        assert (rel_instance.one_id, rel_instance.foreign_id) == (parent.id, parent.id)
+        assert not instance._state.adding and instance._state.db == 'default'
+    assert len(queries) == 1
+
+    (tortoise_instance,) = to_tortoise(ModelA.objects.filter(id=parent.id))
+    assert serialize_model_a(tortoise_instance) == serialize_model_a(instances[0])
+    assert tortoise_instance._saved_in_db and not tortoise_instance._partial
+    assert (await to_tortoise([rel])[0].foreign).id == parent.id
+
+    (partial_instance,) = to_tortoise(ModelA.objects.filter(id=parent.id).only('char'))
+    assert partial_instance._partial and partial_instance.char == parent.char
+
+
+@pytest.mark.django_db
+@pytest.mark.asyncio
+async def test_lazy_json_values(generate_a_as_dict):
+    pytest.importorskip('orjson')
+    parent = ModelA.objects.create(**generate_a_as_dict())
+
+    with override_settings(DJANGO_TORTOISE={'JSON_CODEC': ('orjson.dumps', 'orjson.loads'), 'LAZY_JSON': True}):
+        instance = await ModelA.abjects.get(id=parent.id)
+        assert isinstance(instance.__dict__['json'], LazyJSON)
+        assert to_django([instance])[0].json == parent.json
+        assert instance.json == parent.json and instance.__dict__['json'] == parent.json
+
+        (instance,) = await ModelA.abjects.filter(id=parent.id)
+        instance.json = {'lazy': [1, 2]}
+        await instance.save()
+        assert ModelA.objects.get(id=parent.id).json == {'lazy': [1, 2]}
+
+    instance = await ModelA.abjects.get(id=parent.id)
+    assert instance.__dict__['json'] == {'lazy': [1, 2]}
+    assert not isinstance(ModelA.abjects.__dict__.get('json'), LazyJSONAttribute)
+
+
+@pytest.mark.django_db
+def test_deferred_fields(generate_a_as_dict):
+    # rows are written by abjects, the sync bridge does not see the transaction of the test
+    parents = [run_sync(ModelA.abjects.create(**generate_a_as_dict())) for _ in range(3)]
+    ids = [parent.id for parent in parents]
+    queryset = ModelA.abjects.filter(id__in=ids).order_by('id')
+
+    async def get_text(instance):
+        return instance.text
+
+    records = []
+    add_query_callback(records.append)
+    try:
+        with override_settings(DJANGO_TORTOISE={'DEFER': {'test_app_a.ModelA': ('TextField', 'BinaryField')}}):
+            instances = run_sync(queryset)
+            assert instances[0].get_deferred_fields() == {'text', 'binary'}
+            assert '"text"' not in records[-1].sql and instances[0].char == parents[0].char
+
+            with pytest.raises(NoValuesFetched):
+                run_sync(get_text(instances[0]))
+
+            records.clear()
+            assert [instance.text for instance in instances] == [parent.text for parent in parents]
+            assert len(records) == 1 and not instances[2].get_deferred_fields() & {'text'}
+
+            run_sync(fetch_deferred(instances))
+            assert [bytes(instance.binary) for instance in instances] == [bytes(parent.binary) for parent in parents]
+            assert len(records) == 2
+
+            (instance,) = run_sync(ModelA.abjects.filter(id=ids[0]))
+            instance.char = 'deferred'
+            run_sync(instance.save())
+            assert instance.get_deferred_fields() == {'text', 'binary'}
+
+        instance = run_sync(ModelA.abjects.get(id=ids[0]))
+        assert instance.char == 'deferred' and instance.__dict__['text'] == parents[0].text
+    finally:
+        remove_query_callback(records.append)
+        run_sync(ModelA.abjects.filter(id__in=ids).delete())
+        stop_background_loop()
+
+
+@pytest.mark.django_db
+@pytest.mark.asyncio
+async def test_hydrated_deferred_rows(generate_a_as_dict):
+    parent = ModelA.objects.create(**generate_a_as_dict())
+    _, (row,) = await connections.get('default').execute_query(
+        f'SELECT * FROM {ModelA._meta.db_table} WHERE id = ?', [parent.id]
+    )
+    deferred_row = {name: value for name, value in dict(row).items() if name not in ('text', 'binary')}
+
+    with override_settings(DJANGO_TORTOISE={'DEFER': {'test_app_a.ModelA': ('TextField', 'BinaryField')}}):
+        # sqlite rows and asyncpg records
+        for rows in ([deferred_row], [RecordRow(deferred_row)]):
+            (instance,) = hydrate(ModelA.abjects, rows, 'default')
+            assert instance.get_deferred_fields() == {'text', 'binary'} and instance.char == parent.char
+            assert not instance._partial and instance.__dict__[BATCH].instances == [instance]
+
+            await fetch_deferred([instance])
+            assert instance.text == parent.text and bytes(instance.binary) == bytes(parent.binary)
+
+
+@pytest.mark.django_db
+@pytest.mark.asyncio
+async def test_queryset_translation(generate_a_as_dict):
+    parents = [ModelA.objects.create(**generate_a_as_dict()) for _ in range(4)]
+    ids = [parent.id for parent in parents]
+    for parent in parents[:2]:
+        rel = ModelARel.objects.create(one=parent, foreign=parents[0])
+        rel.many.set(parents[1:])
+
+    related_or_large = Q(foreigns__isnull=False) | Q(integer__gt=F('small_int') + 1)
+    querysets = [
+        ModelA.objects.filter(related_or_large, id__in=ids).order_by('-id'),
+        ModelA.objects.filter(id__in=ids).exclude(one__foreign__id=ids[0]).order_by('id')[1:3],
+        ModelARel.objects.filter(many__id=ids[3], one__in=ids).select_related('one', 'foreign').order_by('one__id'),
+        ModelARel.objects.filter(one__in=ids).annotate(n=Count('many')).filter(n__gt=2).order_by('id'),
+    ]
+    for queryset in querysets:
+        assert [instance.id for instance in await queryset.as_abjects()] == [instance.id for instance in queryset]
+
+    values = ModelA.objects.filter(id__in=ids).values('boolean').annotate(n=Count('id')).order_by('boolean')
+    assert await values.as_abjects() == list(values)
+    flat_values = ModelA.objects.filter(id__in=ids).values_list('id', flat=True).order_by('id')
+    assert await flat_values.as_abjects() == list(flat_values)
+
+    unsupported = [
+        ModelA.objects.exclude(many__id=ids[3]),
+        ModelA.objects.annotate(lower=Lower('char')),
+        ModelA.objects.filter(date__year=2020),
+        ModelA.objects.filter(id__in=ModelARel.objects.values('one')),
+        ModelA.objects.filter(foreigns__id=1).filter(foreigns__id=2),
+        ModelA.objects.union(ModelA.objects.all()),
+    ]
+    for queryset in unsupported:
+        with pytest.raises(NotSupportedError):
+            queryset.as_abjects()
+
+
+@pytest.mark.django_db
+@pytest.mark.asyncio
+async def test_json_streaming_response():
+    prefix = uuid.uuid4().hex[:8]
+    User.objects.bulk_create([User(username=f'{prefix}-{i}', is_superuser=i == 0) for i in range(5)])
+    expected = list(User.objects.order_by('id').values('username', 'is_superuser'))
+
+    response = JsonStreamingResponse(User.abjects.all(), fields=('username', 'is_superuser'), chunk_size=2)
+    parts = [part async for part in response]
+    assert len(parts) == (len(expected) + 1) // 2 + 1
+    assert json.loads(b''.join(parts)) == expected
+
+    empty_response = JsonStreamingResponse(User.abjects.filter(username=prefix))
+    assert b''.join([part async for part in empty_response]) == b'[]'
+
+    users = User.abjects.filter(username__startswith=prefix)
+    usernames = [{'username': row['username']} for row in expected if row['username'].startswith(prefix)]
+    descending_response = JsonStreamingResponse(users.order_by('-id'), fields=('username',), chunk_size=2)
+    descending = json.loads(b''.join([part async for part in descending_response]))
+    assert descending == usernames[::-1]
+    with pytest.raises(ParamsError):
+        JsonStreamingResponse(users.order_by('-date_joined'))
+
+    gzip_response = JsonStreamingResponse(users, fields=('username',))
+    middleware = GZipMiddleware(lambda request: gzip_response)
+    gzip_request = RequestFactory().get('/users/stream/', HTTP_ACCEPT_ENCODING='gzip')
+    if django.VERSION[:2] >= (4, 2):
+        assert middleware(gzip_request)['Content-Encoding'] == 'gzip'
+        body = gzip.decompress(b''.join([part async for part in gzip_response]))
+        assert json.loads(body) == usernames
+    else:
+        # GZipMiddleware wraps the content into a sync generator before django 4.2
+        with pytest.raises(TypeError):
+            middleware(gzip_request)
+
+    request = ApplicationCommunicator(BoostedASGIHandler(ASGIHandler()), {
+        'type': 'http',
+        'method': 'GET',
+        'path': '/users/stream/',
+        'query_string': b'',
+        'headers': [(b'host', b'testserver')],
+    })
+    try:
+        await request.send_input({'type': 'http.request', 'body': b''})
+        start = await request.receive_output()
+        assert start['status'] == 200 and (b'Content-Type', b'application/json') in start['headers']
+
+        body = b''
+        while True:
+            message = await request.receive_output()
+            body += message.get('body', b'')
+            if not message.get('more_body'):
+                break
+    finally:
+        await close_connections()
+
+    assert json.loads(body) == expected
+
+
+@pytest.mark.django_db
+@pytest.mark.asyncio
+async def test_compiled_serializers(generate_a_as_dict):
+    parents = [ModelA.objects.create(**generate_a_as_dict()) for _ in range(2)]
+    rel = ModelARel.objects.create(one=parents[0], foreign=parents[1])
+    rel.many.set(parents)
+
+    instance = await ModelA.abjects.get(id=parents[0].id)
+    assert get_serializer(ModelA)(instance) == serialize_model_a(instance)
+
+    serialize_json = get_serializer(ModelA, json=True)
+    expected = json.loads(json.dumps({**serialize_model_a(instance), 'binary': None}, cls=DjangoJSONEncoder))
+    data = serialize_json(instance)
+    assert json.loads(json.dumps(data)) == {**expected, 'binary': data['binary']}
+    assert base64.b64decode(data['binary']) == bytes(instance.binary)
+
+    rel_queryset = ModelARel.abjects.filter(id=rel.id).select_related('one', 'foreign').prefetch_related('many')
+    rel_instance = await rel_queryset.get()
+    serialize_rel = get_serializer(ModelARel, related=('one', 'foreign', 'many'))
+    assert serialize_rel(rel_instance) == serialize_model_a_rel(rel_instance)
+    assert get_serializer(ModelARel, fields=('id',), related=('foreign',)) is get_serializer(
+        ModelARel.abjects, fields=['id'], related=['foreign']
+    )
+
+    with pytest.raises(NoValuesFetched):
+        get_serializer(ModelARel, related=('many',))(await ModelARel.abjects.get(id=rel.id))